@@ -2,15 +2,51 @@
 """
 Script to fetch the latest game configuration data from Idle Clans API
 and save it to data/configData.json
+
+Also writes the binary snapshot used for fast startup, data/configData.snapshot
+or $CONFIG_SNAPSHOT_PATH. Run with --snapshot-only to rebuild it from the
+existing file.
+
+Every config version is kept once, compressed, in data/backups. Use
+--list-backups, --diff OLD [NEW] and --restore VERSION to work with them.
 """
 
-import json
+import argparse
 import os
+import time
 from datetime import datetime
 from services.api_client import APIClient
+from services.config_backups import (
+    DEFAULT_BACKUP_DIR,
+    DEFAULT_KEEP_DAYS,
+    DEFAULT_KEEP_VERSIONS,
+    ConfigBackupStore,
+    file_hash,
+)
+from services.config_loader import (
+    DEFAULT_CONFIG_PATH,
+    DEFAULT_SNAPSHOT_PATH,
+    build_config_snapshot,
+    config_source_hash,
+    load_config_snapshot,
+)
+from services.config_stream import CHUNK_SIZE, decode_chunks, read_config_file, read_config_stream
+
+
+def read_valid_config(file_path):
+    """Items and Tasks of a config file, None if the file is cut off or misses a section"""
+    try:
+        config_data = read_config_file(file_path)
+    except ValueError as e:
+        print(f"❌ Invalid configuration file {file_path}: {e}")
+        return None
+    if not config_data.get('Items', {}).get('Items') or not config_data.get('Tasks'):
+        print(f"❌ Configuration file {file_path} has no Items or Tasks")
+        return None
+    return config_data
 
 
-def fetch_game_config():
+def fetch_game_config(keep_versions=DEFAULT_KEEP_VERSIONS, keep_days=DEFAULT_KEEP_DAYS):
     """Fetch game configuration from API and save to file"""
     print("🔄 Fetching game configuration from Idle Clans API...")
 
@@ -20,48 +56,68 @@ def fetch_game_config():
     # Fetch game configuration
     try:
         # First, let's try to get the raw response
-        import requests
         url = f"{api_client.base_url}/Configuration/game-data"
         print(f"📡 Fetching from: {url}")
-        response = requests.get(url)
+        response = api_client.get_raw("Configuration/game-data", stream=True)
+        if response is None:
+            print("❌ No response from API")
+            return False
         print(f"📨 Status Code: {response.status_code}")
         print(f"📋 Content-Type: {response.headers.get('Content-Type')}")
-        print(f"📏 Response Length: {len(response.text)} bytes")
-        print(f"🔍 First 200 chars: {response.text[:200]}")
 
         if response.status_code != 200:
             print(f"❌ HTTP Error: {response.status_code}")
+            response.close()
             return False
 
-        # Clean MongoDB export format (same as TaskService does)
-        import re
-        raw_text = response.text
-        print("🧹 Cleaning MongoDB export format...")
-        # Remove ObjectId() wrapper
-        raw_text = re.sub(r'ObjectId\("([^"]+)"\)', r'"\1"', raw_text)
-        # Remove _id fields completely
-        raw_text = re.sub(r'^\s*"_id":\s*"[^"]*",?\s*\n', '', raw_text, flags=re.MULTILINE)
-
-        # Try to parse as JSON
-        config_data = json.loads(raw_text)
-
-        if not config_data:
+        # Stream the body: MongoDB quirks are cleaned while tokenizing, the cleaned
+        # text goes straight to a temp file and only Items/Tasks are decoded
+        config_path = DEFAULT_CONFIG_PATH
+        tmp_path = f"{config_path}.download"
+        print(f"🧹 Streaming and cleaning MongoDB export format into {tmp_path}...")
+        try:
+            with response, open(tmp_path, 'w', encoding='utf-8') as f:
+                config_data = read_config_stream(
+                    decode_chunks(response.iter_content(chunk_size=CHUNK_SIZE), response.encoding or 'utf-8'),
+                    sink=f.write
+                )
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        print(f"📏 Response Length: {os.path.getsize(tmp_path)} bytes")
+
+        # Read back what was written: a cut off download must never replace the config
+        config_data = read_valid_config(tmp_path)
+        if config_data is None:
             print("❌ Failed to fetch configuration data")
+            os.remove(tmp_path)
             return False
 
         print(f"✅ Successfully fetched configuration data")
 
-        # Create backup of old config if it exists
-        config_path = "data/configData.json"
+        new_hash = file_hash(tmp_path)
+        if os.path.exists(config_path) and file_hash(config_path) == new_hash:
+            print(f"💤 Configuration unchanged ({new_hash[:12]}), nothing to save")
+            os.remove(tmp_path)
+            return True
+
+        # Keep the old config in the backup store (stored once per distinct content)
+        backups = ConfigBackupStore(DEFAULT_BACKUP_DIR)
         if os.path.exists(config_path):
-            backup_path = f"data/configData.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            print(f"📦 Creating backup: {backup_path}")
-            os.rename(config_path, backup_path)
+            old_hash, added = backups.save(config_path)
+            print(f"📦 Backup {'stored' if added else 'already present'}: {old_hash[:12]}")
 
         # Save new configuration
         print(f"💾 Saving configuration to {config_path}")
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, config_path)
+        backups.save(config_path, new_hash)
+        deleted = backups.prune(keep_versions, keep_days)
+        if deleted:
+            print(f"🧹 Removed {deleted} backup(s) beyond the retention policy")
+
+        # Pre-digest the item/task tables for fast service startup
+        build_snapshot(config_path, config_data)
 
         # Print some stats
         print("\n📊 Configuration Statistics:")
@@ -89,7 +145,95 @@ def fetch_game_config():
         return False
 
 
+def build_snapshot(config_path=DEFAULT_CONFIG_PATH, config_data=None):
+    """Write the binary config snapshot the services load on startup, unless it is up to date"""
+    try:
+        started = time.perf_counter()
+        source_hash = config_source_hash(config_path)
+        if load_config_snapshot(source_hash, DEFAULT_SNAPSHOT_PATH) is not None:
+            print(f"💤 Snapshot up to date: {DEFAULT_SNAPSHOT_PATH} (source {source_hash[:12]})")
+            return True
+        source_hash = build_config_snapshot(config_path, DEFAULT_SNAPSHOT_PATH, config_data)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        size_kb = os.path.getsize(DEFAULT_SNAPSHOT_PATH) / 1024
+        print(f"🗜️  Snapshot written: {DEFAULT_SNAPSHOT_PATH} ({size_kb:.0f} KB, source {source_hash[:12]}, {elapsed_ms:.0f}ms)")
+        return True
+    except Exception as e:
+        # The services fall back to parsing the JSON, so this is not fatal
+        print(f"⚠️  Could not write config snapshot: {e}")
+        return False
+
+
+def list_backups(backups):
+    """Print the stored config versions, newest first"""
+    versions = backups.versions()
+    if not versions:
+        print("No backups stored yet")
+        return True
+    current_hash = file_hash(DEFAULT_CONFIG_PATH) if os.path.exists(DEFAULT_CONFIG_PATH) else None
+    for position, version in reversed(list(enumerate(versions, start=-len(versions)))):
+        saved_at = datetime.fromtimestamp(version['saved_at']).strftime('%Y-%m-%d %H:%M:%S')
+        marker = " (current)" if version['hash'] == current_hash else ""
+        print(
+            f"  {position:>3}  {version['hash'][:12]}  {saved_at}  "
+            f"{version['size'] / 1024:.0f} KB -> {version['compressed_size'] / 1024:.0f} KB{marker}"
+        )
+    return True
+
+
+def diff_backups(backups, old_ref, new_ref=None):
+    """Print the item/task diff between two stored versions (or a version and the current config)"""
+    diff = backups.diff(old_ref, new_ref)
+    print(f"🧾 {old_ref} -> {new_ref or 'current'}: {diff.summary()}")
+    for label, entries in (
+        ("Items added", diff.items_added),
+        ("Items removed", diff.items_removed),
+        ("Items changed", diff.items_changed),
+        ("Tasks added", diff.tasks_added),
+        ("Tasks removed", diff.tasks_removed),
+        ("Tasks changed", diff.tasks_changed),
+    ):
+        if entries:
+            print(f"  - {label}: {', '.join(str(entry) for entry in entries)}")
+    return True
+
+
+def restore_backup(backups, ref):
+    """Write a stored version back to data/configData.json and rebuild the snapshot"""
+    source_hash = backups.restore(ref, DEFAULT_CONFIG_PATH)
+    print(f"♻️  Restored {source_hash[:12]} to {DEFAULT_CONFIG_PATH}")
+    return build_snapshot()
+
+
 if __name__ == "__main__":
     print("=== Idle Clans Config Fetcher ===\n")
-    success = fetch_game_config()
+    parser = argparse.ArgumentParser(description="Fetch the Idle Clans game config and manage its backups")
+    parser.add_argument("--snapshot-only", action="store_true",
+                        help="rebuild the binary snapshot from the existing config without fetching")
+    parser.add_argument("--list-backups", action="store_true", help="list the stored config versions")
+    parser.add_argument("--diff", nargs="+", metavar="VERSION",
+                        help="item/task diff between OLD and NEW (default: current config)")
+    parser.add_argument("--restore", metavar="VERSION",
+                        help="restore a stored version (hash prefix, or -1 for the newest)")
+    parser.add_argument("--keep-versions", type=int, default=DEFAULT_KEEP_VERSIONS,
+                        help=f"backups to keep (default {DEFAULT_KEEP_VERSIONS})")
+    parser.add_argument("--keep-days", type=float, default=DEFAULT_KEEP_DAYS,
+                        help=f"drop backups older than this (default {DEFAULT_KEEP_DAYS})")
+    args = parser.parse_args()
+
+    try:
+        if args.snapshot_only:
+            # Rebuild the snapshot from the existing config without fetching
+            success = build_snapshot()
+        elif args.list_backups:
+            success = list_backups(ConfigBackupStore(DEFAULT_BACKUP_DIR))
+        elif args.diff:
+            success = diff_backups(ConfigBackupStore(DEFAULT_BACKUP_DIR), *args.diff[:2])
+        elif args.restore:
+            success = restore_backup(ConfigBackupStore(DEFAULT_BACKUP_DIR), args.restore)
+        else:
+            success = fetch_game_config(args.keep_versions, args.keep_days)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        success = False
     exit(0 if success else 1)
@@ -1,7 +1,12 @@
+import gzip
+import hashlib
 import json
+import os
 import time
 import threading
-from datetime import datetime
+from functools import lru_cache
+from datetime import datetime, timezone
+import numpy as np
 from flask import Flask, render_template, jsonify, request, make_response
 from flask_babel import Babel, gettext, ngettext, lazy_gettext
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -14,9 +19,36 @@ from services import (
     PlayerMarketService,
     ItemService,
     TaskService,
+    PriceBook,
+    EfficiencyEngine,
+    load_game_config,
 )
+from services.config_loader import DEFAULT_CONFIG_PATH
+from services.config_reload import ConfigWatcher, diff_game_data
+from services.efficiency_engine import RankedTasks
+from services.level_planner import LevelPlanner
+from services.player_profile import PlayerModifiers, skill_key, player_arrays
+from services.production_graph import ProductionGraph
+from services.result_snapshot import (
+    DEFAULT_SNAPSHOT_CACHE_PATH,
+    CategoryRows,
+    ResultSnapshot,
+    TaskRow,
+    load_snapshot,
+    save_snapshot,
+    task_fingerprint,
+)
+from services.price_history import DEFAULT_PRICE_HISTORY_PATH, PriceHistoryStore
+from services.rolling_aggregates import RollingAggregates
+from services.task_ranking import TaskRanker, parse_weights
 from utils import AsciiUI
 
+try:
+    import brotli
+except ImportError:
+    # Optional: pages are served gzip-compressed only
+    brotli = None
+
 # Initialize Flask app
 app = Flask(__name__)
 
@@ -93,15 +125,68 @@ clan_service = ClanService(api_client)
 leaderboard_service = LeaderboardService(api_client)
 player_service = PlayerService(api_client)
 player_market_service = PlayerMarketService(api_client)
-# Initialize local DataServices
-item_service = ItemService()
-task_service = TaskService(item_service)
+# Initialize local DataServices - the game config is parsed once and shared
+startup_timings = {}
+_startup_started = time.perf_counter()
+game_config = load_game_config()
+startup_timings['config_parse_ms'] = round((time.perf_counter() - _startup_started) * 1000, 1)
+_step_started = time.perf_counter()
+item_service = ItemService(config=game_config)
+startup_timings['item_service_ms'] = round((time.perf_counter() - _step_started) * 1000, 1)
+_step_started = time.perf_counter()
+task_service = TaskService(item_service, config=game_config)
+startup_timings['task_service_ms'] = round((time.perf_counter() - _step_started) * 1000, 1)
+_step_started = time.perf_counter()
+efficiency_engine = EfficiencyEngine(task_service)
+production_graph = ProductionGraph(task_service)
+startup_timings['engine_compile_ms'] = round((time.perf_counter() - _step_started) * 1000, 1)
+# Category of every task id, and the rankings kept up to date across refreshes
+task_categories = [category for category in task_service.categories for _task in category.tasks]
+category_rankings = {category.name: RankedTasks() for category in task_service.categories}
+all_tasks_ranking = RankedTasks()
+# Latest TaskRow per calculated task id
+task_rows = {}
+# Persisted copy of the latest snapshot, served right away on the next start
+SNAPSHOT_CACHE_PATH = os.environ.get('SNAPSHOT_CACHE_PATH', DEFAULT_SNAPSHOT_CACHE_PATH)
+TASK_FINGERPRINT = task_fingerprint(task_service.tasks)
+# Every fetched snapshot is kept here, the 7d/30d price strategies are computed from it
+PRICE_HISTORY_PATH = os.environ.get('PRICE_HISTORY_PATH', DEFAULT_PRICE_HISTORY_PATH)
+try:
+    price_history = PriceHistoryStore(PRICE_HISTORY_PATH)
+except Exception as e:
+    price_history = None
+    print(f"⚠️  Price history disabled, could not open {PRICE_HISTORY_PATH}: {e}")
+# Rolling 7d/30d/VWAP/median per item, updated with every snapshot and warmed from the history
+price_aggregates = RollingAggregates()
+if price_history is not None:
+    try:
+        price_aggregates.warm(price_history, time.time())
+    except Exception as e:
+        print(f"⚠️  Could not warm price aggregates from {PRICE_HISTORY_PATH}: {e}")
+# Seconds a not-ready client is asked to wait before retrying
+LOADING_RETRY_AFTER = 5
+# configData.json is checked this often and reloaded in place when its content changes
+CONFIG_RELOAD_INTERVAL_SECONDS = int(os.environ.get('CONFIG_RELOAD_INTERVAL_SECONDS', 60))
+config_watcher = ConfigWatcher(DEFAULT_CONFIG_PATH)
+startup_timings['total_ms'] = round((time.perf_counter() - _startup_started) * 1000, 1)
+print(
+    f"⏱️  Startup: config {startup_timings['config_parse_ms']}ms | "
+    f"items {startup_timings['item_service_ms']}ms | "
+    f"tasks {startup_timings['task_service_ms']}ms | "
+    f"engine {startup_timings['engine_compile_ms']}ms | "
+    f"total {startup_timings['total_ms']}ms"
+)
 ascii_ui = AsciiUI()
 
 latest_prices = None
+price_book = None
 character = None
-cached_data = None
+# Published ResultSnapshot - replaced as a whole, never modified, read without locking
+current_snapshot = None
 last_update = None
+# Wall time of the last full recompute, logged as saved when the prices are unchanged
+last_recompute_ms = 0.0
+# Serializes refreshes; only the background job's own state below needs it
 data_lock = threading.Lock()
 scheduler = None
 health_status = {
@@ -114,158 +199,42 @@ health_status = {
 
 
 def fetchPrices():
-    global latest_prices
+    """Fetch the latest prices, returns the ConditionalResponse (None on failure)"""
+    global latest_prices, price_book
     # Get prices with average price (24h) included
-    latest_prices = player_market_service.get_items_prices_latest(
+    response = player_market_service.get_items_prices_latest_if_changed(
         include_average_price=True
     )
+    if response is not None:
+        record_price_history(response.data)
+        price_aggregates.update(response.data, time.time())
+    if response is not None and not response.changed and price_book is not None:
+        # Same snapshot as last time, keep the existing PriceBook (and its version)
+        return response
+
+    latest_prices = response.data if response is not None else None
+    # Index the snapshot once so lookups during the calculation are O(1)
+    price_book = PriceBook(latest_prices, PRICE_STRATEGY, price_aggregates.history()) if latest_prices is not None else None
+    return response
 
 
-def calculateEfficiency(task, character={"xp_multiplier": 1, "time_multiplier": 1}, verbose=True, collect_missing=False):
-    # Todo: Calculate effective time from time multiplier
-    # effective_time = character["time_multiplier"] * task.base_time
-    # Convert from milliseconds to seconds
-    effective_time = task.base_time / 1000.0
-
-    # Skip tasks with invalid data
-    if task.item_reward is None:
-        if verbose:
-            print(f"Skipping task '{task.name}' - no item reward")
-        return False
-
-    if effective_time <= 0:
-        if verbose:
-            print(f"Skipping task '{task.name}' - invalid base time: {effective_time}")
-        return False
-
-    # Calculate xp/time
-    task.xp_efficiency = character["xp_multiplier"] * task.exp_reward / effective_time
-    task.gold_efficiency_calculation_time = time.time()
-
-    # Calculate profit (revenue - costs) / time
-    if latest_prices == None:
-        if verbose:
-            print("Latest market prices are unavailable for gold calculation")
-        return False
-
-    # Calculate revenue
-    item_price_data = latest_prices_get_item(latest_prices, task.item_reward.id)
-    if not item_price_data:
-        if verbose:
-            print(f"  No market data for {task.item_reward.id}")
-        return False
-
-    # Use new price function for selling
-    sell_price = get_item_price(item_price_data, price_type='sell')
-    if sell_price is None:
-        if verbose:
-            print(f"  Missing price data for {task.item_reward.id} - skipping task")
-        return False
-
-    revenue = max(
-        task.item_reward.base_value * task.item_amount,
-        sell_price * task.item_amount
-    )
-    task.sold_as_base_price = task.item_reward.base_value >= sell_price
-
-    # Calculate material costs
-    total_cost = 0
-    for cost in task.costs or []:
-        if cost.item:
-            cost_item_price_data = latest_prices_get_item(latest_prices, cost.item.id)
-            if not cost_item_price_data:
-                if verbose:
-                    print(f"  Missing market data for material {cost.item.id} - skipping task")
-                return False
-
-            # Use new price function for buying materials
-            buy_price = get_item_price(cost_item_price_data, price_type='buy')
-            if buy_price is None:
-                if verbose:
-                    print(f"  Missing price for material {cost.item.id} - skipping task")
-                return False
-
-            material_cost = buy_price * cost.amount
-            total_cost += material_cost
-
-    # Calculate net profit and efficiency
-    net_profit = revenue - total_cost
-    task.gold_efficiency = net_profit / effective_time
-    task.total_cost = total_cost
-    task.revenue = revenue
-    task.net_profit = net_profit
-    task.xp_efficiency_calculation_time = time.time()
-
-    # Create tooltip for cost breakdown
-    task.cost_tooltip = create_cost_tooltip(task.costs or [], latest_prices, collect_missing)
-
-    if verbose:
-        # Print efficiency results for this task
-        print(f"Task: {task.name}")
-        print(f"  Revenue: {task.revenue:.2f} gold ({task.item_amount}x items)")
-        print(f"  Costs: {task.total_cost:.2f} gold (materials)")
-        print(f"  Net Profit: {task.net_profit:.2f} gold")
-        print(f"  Time: {effective_time:.0f}s")
-        print(f"  Profit/sec: {task.gold_efficiency:.3f} gold/sec")
-        print(f"  XP/sec: {task.xp_efficiency:.2f}")
-        print()
-
-    return True
-
+def record_price_history(prices):
+    """Append a snapshot to the local history, a failing store never blocks a refresh"""
+    if price_history is None:
+        return
+    try:
+        price_history.record(prices)
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️  Could not record price history: {e}")
 
-def latest_prices_get_item(latest_prices, id):
-    for item in latest_prices:
-        if item["itemId"] == id:
-            return item
 
 # Price strategy configuration (can be made configurable later)
 PRICE_STRATEGY = {
-    'sell': 'average_1d',  # Options: 'instant', 'average_1d', 'average_7d', 'average_30d'
-    'buy': 'instant'       # Options: 'instant', 'average_1d', 'average_7d', 'average_30d'
+    'sell': 'average_1d',  # Options: 'instant', 'average_1d', 'average_7d', 'average_30d', 'vwap_7d', 'median_7d'
+    'buy': 'instant'       # Options: 'instant', 'average_1d', 'average_7d', 'average_30d', 'vwap_7d', 'median_7d'
 }
 
-def get_item_price(item_price_data, price_type='sell'):
-    """
-    Get the price for an item based on configured strategy
-
-    Args:
-        item_price_data: Price data from API for a specific item
-        price_type: 'sell' for revenue calculation, 'buy' for cost calculation
-
-    Returns:
-        float or None: The price to use for calculations, None if data is missing
-    """
-    if not item_price_data:
-        return None
-
-    strategy = PRICE_STRATEGY.get(price_type, 'average_1d')
-
-    if strategy == 'instant':
-        if price_type == 'sell':
-            # Instant sell: what buyers are offering right now
-            return item_price_data.get("highestBuyPrice")
-        else:
-            # Instant buy: what sellers are asking right now
-            return item_price_data.get("lowestSellPrice")
-
-    elif strategy == 'average_1d':
-        # Use 24h average price (more stable, realistic)
-        avg_price = item_price_data.get("dailyAveragePrice")
-        # If average is 0, item wasn't traded in 24h - fallback to instant
-        if avg_price and avg_price > 0:
-            return avg_price
-        # Fallback to instant prices for items without recent trades
-        if price_type == 'sell':
-            return item_price_data.get("highestBuyPrice")
-        else:
-            return item_price_data.get("lowestSellPrice")
-
-    # For future strategies (7d, 30d averages)
-    # TODO: Implement 7d and 30d averages when we fetch comprehensive data
-    return None
-
-
-def create_cost_tooltip(costs, latest_prices, collect_missing=False):
+def create_cost_tooltip(costs, price_book, collect_missing=False, locale=None):
     """Create a tooltip showing cost breakdown"""
     if not costs:
         return _("No materials required")
@@ -274,16 +243,15 @@ def create_cost_tooltip(costs, latest_prices, collect_missing=False):
 
     for cost in costs:
         if cost.item:
-            cost_item_price_data = latest_prices_get_item(latest_prices, cost.item.id)
             # Translate item name
-            item_name = translate_item_name(cost.item.name, collect_missing)
+            item_name = translate_item_name(cost.item.name, collect_missing, locale)
 
-            if cost_item_price_data:
-                unit_price = get_item_price(cost_item_price_data, price_type='buy')
+            if cost.item.id in price_book:
+                unit_price = price_book.buy_price(cost.item.id)
                 if unit_price is not None:
                     total_cost = unit_price * cost.amount
                     # Show price source in tooltip
-                    price_type = "(avg)" if PRICE_STRATEGY['buy'] == 'average_1d' else ""
+                    price_type = "(avg)" if PRICE_STRATEGY['buy'].startswith('average') else ""
                     tooltip_lines.append(f"• {item_name}: {cost.amount}x @ {unit_price:.2f} {price_type} = {total_cost:.2f} gold")
                 else:
                     tooltip_lines.append(f"• {item_name}: {cost.amount}x @ ??? (no price data)")
@@ -293,11 +261,36 @@ def create_cost_tooltip(costs, latest_prices, collect_missing=False):
     return "\n".join(tooltip_lines)
 
 
-def translate_item_name(item_key, collect_missing=False):
+TOOLTIP_CACHE_SIZE = 2048
+
+
+def get_cost_tooltip(task_id, snapshot, locale=None):
+    """Cost breakdown tooltip of a task, built on first access per locale and data version"""
+    if snapshot is None or snapshot.price_book is None:
+        return None
+    locale = locale or get_locale()
+    try:
+        return _cached_cost_tooltip(task_id, locale, snapshot.version)
+    except LookupError:
+        # A newer snapshot was published meanwhile, answer from the one asked for without caching
+        return create_cost_tooltip(snapshot.tasks[task_id].costs or [], snapshot.price_book, locale=locale)
+
+
+@lru_cache(maxsize=TOOLTIP_CACHE_SIZE)
+def _cached_cost_tooltip(task_id, locale, version):
+    # Keyed on the version only so no snapshot is kept alive, cleared by publish_snapshot()
+    snapshot = current_snapshot
+    if snapshot is None or snapshot.version != version:
+        raise LookupError(version)  # Never cached
+    task = snapshot.tasks[task_id]
+    return create_cost_tooltip(task.costs or [], snapshot.price_book, locale=locale)
+
+
+def translate_item_name(item_key, collect_missing=False, locale=None):
     """Translate item name with optional collection of missing translations"""
     global missing_translations
 
-    locale = get_locale()
+    locale = locale or get_locale()
     translations = ITEM_TRANSLATIONS.get(locale, {})
 
     if item_key in translations:
@@ -329,154 +322,678 @@ def translate_category_name(category_key, collect_missing=False):
     return category_key
 
 
+def publish_snapshot(snapshot):
+    """Make a snapshot the one every request reads - caller holds data_lock (or is still starting up)"""
+    global current_snapshot
+    current_snapshot = snapshot
+    # Tooltips of older versions can never be asked for again
+    _cached_cost_tooltip.cache_clear()
+
+
+def recalculate(collect_missing_translations=False):
+    """Evaluate the tasks affected since the last refresh and publish a new snapshot - caller holds data_lock"""
+    global last_update, health_status, last_recompute_ms
+
+    recompute_started = time.perf_counter()
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 📊 Analyzing {len(task_service.categories)} categories...")
+
+    # Only re-evaluate the tasks whose input prices changed since the last refresh
+    # (collecting translations needs every tooltip rebuilt, so do a full pass then)
+    plan = None
+    if price_book is not None:
+        plan = efficiency_engine.prepare_refresh(price_book, full=collect_missing_translations)
+
+    # Calculate quality metrics
+    total_tasks_attempted = len(task_service.tasks)
+    tasks_calculated = int(plan.result.valid.sum()) if plan else 0
+    tasks_skipped = total_tasks_attempted - tasks_calculated
+    success_rate = (tasks_calculated / total_tasks_attempted * 100) if total_tasks_attempted > 0 else 0
+
+    # Validate data quality - require at least 40% success rate
+    # (Many tasks have no item_reward or invalid base_time, which is normal for combat/special tasks)
+    if success_rate < 40:
+        health_status['healthy'] = False
+        health_status['message'] = f"Low data quality: {success_rate:.1f}% success rate ({tasks_skipped}/{total_tasks_attempted} tasks skipped)"
+        health_status['tasks_calculated'] = tasks_calculated
+        health_status['tasks_skipped'] = tasks_skipped
+        health_status['last_check'] = datetime.now().isoformat()
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️  Data quality check failed: {success_rate:.1f}% success rate")
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔄 Keeping previous data, skipping update")
+        return current_snapshot  # Keep old data
+
+    efficiency_engine.commit_refresh(plan)
+    # Make-vs-buy plans follow the same prices, only the items downstream of a change are re-solved
+    production_graph.update(price_book)
+
+    # Build rows only for the touched tasks, untouched rows are shared with the previous snapshot
+    for task_id in plan.rows:
+        task = task_service.tasks[task_id]
+        category = task_categories[task_id]
+        if plan.result.valid[task_id]:
+            row = TaskRow.from_result(task, category.name, plan.result)
+            task_rows[task_id] = row
+            category_rankings[category.name].update(task_id, row.gold_efficiency)
+            all_tasks_ranking.update(task_id, row.gold_efficiency)
+            # Tooltips are built lazily by get_cost_tooltip(); only walk them here to record missing names
+            if collect_missing_translations:
+                create_cost_tooltip(task.costs or [], price_book, collect_missing=True)
+        else:
+            task_rows.pop(task_id, None)
+            category_rankings[category.name].update(task_id, None)
+            all_tasks_ranking.update(task_id, None)
+
+    # Use raw names for background job, translation happens per request
+    categories = [
+        CategoryRows(
+            name=category.name,
+            raw_name=category.name,
+            tasks_with_data=tuple(task_rows[task_id] for task_id in category_rankings[category.name].ids())
+        )
+        for category in task_service.categories
+    ]
+    # All tasks by profit efficiency
+    all_tasks = [task_rows[task_id] for task_id in all_tasks_ranking.ids()]
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] ♻️  Recomputed {plan.touched} tasks, reused {plan.reused}")
+
+    # Data is good, publish it with a single reference swap
+    publish_snapshot(ResultSnapshot(
+        version=current_snapshot.version + 1 if current_snapshot else 1,
+        price_book=price_book,
+        tasks=task_service.tasks,
+        categories=categories,
+        all_tasks=all_tasks
+    ))
+    last_update = current_snapshot.created_at
+    last_recompute_ms = (time.perf_counter() - recompute_started) * 1000
+    persist_snapshot(current_snapshot)
+
+    # Update health status
+    health_status['healthy'] = True
+    health_status['message'] = f"OK: {success_rate:.1f}% success rate"
+    health_status['tasks_calculated'] = tasks_calculated
+    health_status['tasks_skipped'] = tasks_skipped
+    health_status['tasks_touched'] = plan.touched
+    health_status['tasks_reused'] = plan.reused
+    health_status['last_check'] = datetime.now().isoformat()
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ Data loading complete! {tasks_calculated}/{total_tasks_attempted} tasks calculated ({success_rate:.1f}%)")
+
+    return current_snapshot
+
+
 def load_and_calculate_data(collect_missing_translations=False):
     """Load market data and calculate efficiency for all tasks - Background job"""
-    global cached_data, last_update, health_status
+    global current_snapshot, last_update, health_status
 
     try:
         with data_lock:
             print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔄 Fetching market prices...")
-            fetchPrices()
-
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] 📊 Analyzing {len(task_service.categories)} categories...")
-
-            # Calculate efficiency for all tasks
-            categories_data = []
-            all_tasks = []
-            total_tasks_attempted = 0
-            tasks_calculated = 0
-
-            for category in task_service.categories:
-                # Use English for background job, avoid translation calls that need request context
-                category_data = {
-                    'name': category.name,  # Use raw name for background job
-                    'raw_name': category.name,  # Keep original for debugging
-                    'tasks_with_data': []
-                }
-
-                for task in category.tasks:
-                    total_tasks_attempted += 1
-                    if calculateEfficiency(task, verbose=False, collect_missing=collect_missing_translations):
-                        task.category_name = category.name  # Use raw name for background job
-                        # Use raw name for background job
-                        task.display_name = task.name
-                        category_data['tasks_with_data'].append(task)
-                        all_tasks.append(task)
-                        tasks_calculated += 1
-
-                # Sort tasks by profit efficiency
-                category_data['tasks_with_data'].sort(key=lambda t: t.gold_efficiency, reverse=True)
-                categories_data.append(category_data)
-
-            # Sort all tasks by profit efficiency
-            all_tasks.sort(key=lambda t: t.gold_efficiency, reverse=True)
-
-            # Calculate quality metrics
-            tasks_skipped = total_tasks_attempted - tasks_calculated
-            success_rate = (tasks_calculated / total_tasks_attempted * 100) if total_tasks_attempted > 0 else 0
-
-            # Validate data quality - require at least 40% success rate
-            # (Many tasks have no item_reward or invalid base_time, which is normal for combat/special tasks)
-            if success_rate < 40:
-                health_status['healthy'] = False
-                health_status['message'] = f"Low data quality: {success_rate:.1f}% success rate ({tasks_skipped}/{total_tasks_attempted} tasks skipped)"
-                health_status['tasks_calculated'] = tasks_calculated
-                health_status['tasks_skipped'] = tasks_skipped
+            response = fetchPrices()
+
+            # Identical snapshot to the one already published: nothing to decode or recompute
+            if (
+                response is not None
+                and not response.changed
+                and current_snapshot is not None
+                and current_snapshot.price_book is price_book
+                and not collect_missing_translations
+            ):
+                how = "304 Not Modified" if response.not_modified else "same body hash"
+                print(
+                    f"[{datetime.now().strftime('%H:%M:%S')}] 💤 Prices unchanged ({how}), "
+                    f"saved {response.bytes_saved / 1024:.1f} KB download and "
+                    f"~{response.decode_ms_saved + last_recompute_ms:.1f} ms CPU "
+                    f"(decode {response.decode_ms_saved:.1f} ms, recompute {last_recompute_ms:.1f} ms)"
+                )
+                health_status['message'] = "OK: prices unchanged"
                 health_status['last_check'] = datetime.now().isoformat()
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️  Data quality check failed: {success_rate:.1f}% success rate")
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔄 Keeping previous data, skipping update")
-                return cached_data  # Keep old data
-
-            # Data is good, update cache
-            new_data = {
-                'categories': categories_data,
-                'all_tasks': all_tasks,
-                'total_categories': len(task_service.categories),
-                'total_tasks': sum(len(cat['tasks_with_data']) for cat in categories_data),
-                'profitable_tasks': len([t for t in all_tasks if t.gold_efficiency > 0]),
-                'top_tasks': all_tasks[:10],
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
+                return current_snapshot
 
-            cached_data = new_data
-            last_update = time.time()
+            recalculate(collect_missing_translations)
 
-            # Update health status
-            health_status['healthy'] = True
-            health_status['message'] = f"OK: {success_rate:.1f}% success rate"
-            health_status['tasks_calculated'] = tasks_calculated
-            health_status['tasks_skipped'] = tasks_skipped
-            health_status['last_check'] = datetime.now().isoformat()
+    except Exception as e:
+        health_status['healthy'] = False
+        health_status['message'] = f"Error: {str(e)}"
+        health_status['last_check'] = datetime.now().isoformat()
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Error updating data: {e}")
+
+    return current_snapshot
 
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ Data loading complete! {tasks_calculated}/{total_tasks_attempted} tasks calculated ({success_rate:.1f}%)")
 
+def reload_game_config():
+    """Background job: swap in a changed configData.json without restarting, recomputing only the changed tasks"""
+    global item_service, task_service, efficiency_engine, production_graph, task_categories
+    global category_rankings, all_tasks_ranking, task_rows, TASK_FINGERPRINT
+
+    change = config_watcher.poll()
+    if change is None:
+        return False
+    source_hash, source_stat = change
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔁 Config changed ({source_hash[:12]}), loading...")
+    started = time.perf_counter()
+    try:
+        # Build the new indexes outside the lock, refreshes and requests keep using the old ones meanwhile
+        new_config = load_game_config()
+        new_item_service = ItemService(config=new_config)
+        new_task_service = TaskService(new_item_service, config=new_config)
+        new_engine = EfficiencyEngine(new_task_service)
+        new_production_graph = ProductionGraph(new_task_service)
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️  Could not load the new config, keeping the current one until the next check: {e}")
+        return False
+
+    try:
+        with data_lock:
+            diff = diff_game_data(item_service, task_service, new_item_service, new_task_service)
+            health_status['config_reload'] = {
+                'source_hash': source_hash[:12],
+                'at': datetime.now().isoformat(),
+                **diff.counts(),
+            }
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 🧾 Config diff: {diff.summary()}")
+            if diff.is_empty:
+                config_watcher.commit(source_hash, source_stat)
+                return False
+
+            # Unchanged tasks keep their results and ranks under their new ids
+            new_engine.carry_over(efficiency_engine, diff.task_map)
+            new_task_categories = [category for category in new_task_service.categories for _task in category.tasks]
+            new_rankings = {category.name: RankedTasks() for category in new_task_service.categories}
+            new_all_tasks_ranking = RankedTasks()
+            new_task_rows = {}
+            for new_id, old_id in diff.task_map.items():
+                row = task_rows.get(old_id)
+                if row is not None:
+                    row = new_task_rows[new_id] = row._replace(id=new_id)
+                    new_rankings[new_task_categories[new_id].name].update(new_id, row.gold_efficiency)
+                    new_all_tasks_ranking.update(new_id, row.gold_efficiency)
+
+            item_service = new_item_service
+            task_service = new_task_service
+            efficiency_engine = new_engine
+            production_graph = new_production_graph
+            task_categories = new_task_categories
+            category_rankings = new_rankings
+            all_tasks_ranking = new_all_tasks_ranking
+            task_rows = new_task_rows
+            TASK_FINGERPRINT = task_fingerprint(task_service.tasks)
+            # Only a swapped config counts as loaded, a failed one is retried on the next poll
+            config_watcher.commit(source_hash, source_stat)
+
+            # Readers switch over with the snapshot, which carries its own task list
+            if price_book is not None:
+                recalculate()
     except Exception as e:
         health_status['healthy'] = False
         health_status['message'] = f"Error: {str(e)}"
         health_status['last_check'] = datetime.now().isoformat()
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Error updating data: {e}")
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Error reloading config: {e}")
+        return False
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ Config reloaded in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return True
+
+
+def persist_snapshot(snapshot):
+    """Write the snapshot to disk for the next warm start, failures only cost the warm start"""
+    try:
+        save_snapshot(snapshot, TASK_FINGERPRINT, SNAPSHOT_CACHE_PATH)
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️  Could not persist snapshot: {e}")
+
+
+def restore_snapshot():
+    """Serve the snapshot of the previous run until the first fetch completes"""
+    global last_update
+
+    snapshot = load_snapshot(TASK_FINGERPRINT, SNAPSHOT_CACHE_PATH)
+    if snapshot is None:
+        return False
+
+    publish_snapshot(snapshot)
+    last_update = snapshot.created_at
+    health_status['message'] = f"Serving cached data from {snapshot.timestamp}, refreshing..."
+    print(f"♨️  Warm start: serving cached data from {snapshot.timestamp} ({snapshot.total_tasks} tasks)")
+    return True
+
+
+class RenderedPage:
+    """index.html rendered once for one locale and data version, with pre-compressed variants"""
+
+    def __init__(self, body, locale, data_version, last_modified):
+        self.locale = locale
+        self.data_version = data_version
+        self.last_modified = last_modified
+        self.etag = f"{locale}-{data_version}-{hashlib.sha1(body).hexdigest()[:16]}"
+        self.bodies = {
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=6, mtime=0),
+        }
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body)
+
+
+# (locale, data version) -> RenderedPage, only the current data version is kept
+rendered_pages = {}
+render_lock = threading.Lock()
 
-    return cached_data
+# Pareto frontier and weighted rankings, cached per weights until the next data version
+task_ranker = TaskRanker()
+RANKING_DEFAULT_LIMIT = 100
+
+# Level plans, cached per (skill, start level, target, objective, data version)
+level_planner = LevelPlanner()
+
+
+def render_index(snapshot, collect_missing=False, player=None):
+    """Render index.html for the current user's language from an immutable snapshot"""
+    context = snapshot.as_template_context()
+    context['player'] = player
+    context['categories'] = [
+        category._replace(name=translate_category_name(category.raw_name, collect_missing))
+        for category in snapshot.categories
+    ]
+
+    # Make translation functions available in template
+    context['_'] = _
+    context['translate_item_name'] = lambda key: translate_item_name(key, collect_missing)
+    context['translate_category_name'] = lambda key: translate_category_name(key, collect_missing)
+
+    return render_template('index.html', **context)
+
+
+def get_rendered_page(snapshot, locale):
+    """Rendered index page for a locale, rendered at most once per data refresh"""
+    key = (locale, snapshot.version)
+    page = rendered_pages.get(key)
+    if page is not None:
+        return page
+
+    with render_lock:
+        # Another thread may have rendered it while we waited
+        page = rendered_pages.get(key)
+        if page is None:
+            body = render_index(snapshot).encode('utf-8')
+            last_modified = datetime.fromtimestamp(snapshot.created_at, tz=timezone.utc)
+            page = RenderedPage(body, locale, snapshot.version, last_modified)
+            for stale_key in [k for k in rendered_pages if k[1] != snapshot.version]:
+                del rendered_pages[stale_key]
+            rendered_pages[key] = page
+    return page
+
+
+def serve_rendered_page(page):
+    """Serve a pre-rendered page with the best encoding the client accepts, 304 if unchanged"""
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in page.bodies and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+
+    response = make_response(page.bodies[encoding])
+    response.content_type = 'text/html; charset=utf-8'
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    # Language comes from a cookie, so caches must keep the variants apart
+    response.headers['Vary'] = 'Accept-Encoding, Cookie'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(f"{page.etag}-{encoding}")
+    response.last_modified = page.last_modified
+    return response.make_conditional(request)
 
 
 @app.route('/')
 def index():
-    global cached_data
 
     # Check if user wants to collect missing translations
     collect_missing = request.args.get('i18n') == 'missing'
 
-    # If collecting translations, regenerate data with collection enabled
+    # If collecting translations, recompute the current prices with collection enabled.
+    # No fetch here: the price endpoint's rate limit could block this request (and data_lock)
     if collect_missing:
         print("🔍 Collecting missing translations...")
-        load_and_calculate_data(collect_missing_translations=True)
+        with data_lock:
+            if price_book is not None:
+                recalculate(collect_missing_translations=True)
+
+    # Initial data not loaded yet - answer right away instead of holding a worker thread
+    if not current_snapshot:
+        response = make_response(
+            f'<meta http-equiv="refresh" content="{LOADING_RETRY_AFTER}">'
+            f"<h1>{_('Loading data... Please refresh in a moment.')}</h1>",
+            503
+        )
+        response.headers['Retry-After'] = str(LOADING_RETRY_AFTER)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    # One reference read; the snapshot never changes underneath us, no lock needed
+    snapshot = current_snapshot
+
+    # Collecting translations has to see every lookup, so skip the page cache
+    if collect_missing:
+        return render_index(snapshot, collect_missing)
+
+    return serve_rendered_page(get_rendered_page(snapshot, get_locale()))
 
-    # Wait for initial data if not loaded yet
-    if not cached_data:
-        print("⏳ Waiting for initial data load...")
-        time.sleep(2)  # Give scheduler time to load data
-        if not cached_data:
-            return f"<h1>{_('Loading data... Please refresh in a moment.')}</h1>"
 
-    with data_lock:
-        data_copy = cached_data.copy() if cached_data else {}
+@app.route('/refresh')
+def refresh():
+    """Just refresh the frontend view - no new API calls"""
+    return index()
 
-    # Apply translations to the data copy for current user's language
-    if data_copy and 'categories' in data_copy:
-        for category in data_copy['categories']:
-            # Translate category name for current user
-            category['name'] = translate_category_name(category['raw_name'], collect_missing)
 
-            # Translate task names for current user
-            for task in category['tasks_with_data']:
-                task.display_name = translate_item_name(task.name, collect_missing)
-                task.category_name = translate_category_name(category['raw_name'], collect_missing)
 
-    # Make translation functions available in template
-    data_copy['_'] = _
-    data_copy['translate_item_name'] = lambda key: translate_item_name(key, collect_missing)
-    data_copy['translate_category_name'] = lambda key: translate_category_name(key, collect_missing)
 
-    return render_template('index.html', **data_copy)
+@app.route('/api/tooltip/<int:task_id>')
+def cost_tooltip(task_id):
+    """Cost breakdown of one task, fetched by the page on first hover"""
+    snapshot = current_snapshot
+    if snapshot is None or not snapshot.has_task(task_id):
+        return jsonify({'error': 'Unknown task'}), 404
 
+    # The page asks for the data version it was rendered from, its prices may be outdated by now
+    version = request.args.get('v', type=int)
+    if version is not None and version != snapshot.version:
+        return jsonify({'error': 'Data has been updated', 'version': snapshot.version}), 409
 
-@app.route('/refresh')
-def refresh():
-    """Just refresh the frontend view - no new API calls"""
-    return index()
+    return jsonify({
+        'task_id': task_id,
+        'version': snapshot.version,
+        'tooltip': get_cost_tooltip(task_id, snapshot)
+    })
 
 
+def ranking_from_request(snapshot):
+    """Ranking for the weights and max_level in the query string, raises ValueError on bad input"""
+    weights = parse_weights(request.args)
+    max_level = request.args.get('max_level', '')
+    try:
+        max_level = int(max_level) if max_level != '' else None
+    except ValueError:
+        raise ValueError(f"max_level is not a whole number: {max_level}") from None
+    return task_ranker.rank(snapshot, weights, max_level)
+
+
+def loading_response(body):
+    """503 while the first data load is still running"""
+    response = make_response(body, 503)
+    response.headers['Retry-After'] = str(LOADING_RETRY_AFTER)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@app.route('/api/rankings')
+def rankings_api():
+    """Gold/xp Pareto frontier and weighted-score ranking, e.g. /api/rankings?gold=1&xp=0.5&level=0.2&max_level=60"""
+    snapshot = current_snapshot
+    if snapshot is None:
+        return loading_response(jsonify({'error': 'Data is still loading'}))
+
+    try:
+        ranking = ranking_from_request(snapshot)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    limit = request.args.get('limit', RANKING_DEFAULT_LIMIT, type=int)
+
+    return jsonify({
+        'data_version': ranking.version,
+        'last_update': snapshot.timestamp,
+        'weights': ranking.weights,
+        'max_level': ranking.max_level,
+        'frontier': [entry.as_dict() for entry in ranking.frontier],
+        'total_ranked': len(ranking.ranked),
+        'ranking': [entry.as_dict() for entry in ranking.ranked[:max(limit, 0)]]
+    })
+
+
+@app.route('/rankings')
+def rankings():
+    """Page view of the frontier and the weighted ranking"""
+    snapshot = current_snapshot
+    if snapshot is None:
+        return loading_response(
+            f'<meta http-equiv="refresh" content="{LOADING_RETRY_AFTER}">'
+            f"<h1>{_('Loading data... Please refresh in a moment.')}</h1>"
+        )
+
+    error = None
+    try:
+        ranking = ranking_from_request(snapshot)
+    except ValueError as e:
+        error = str(e)
+        ranking = task_ranker.rank(snapshot)
+    limit = request.args.get('limit', RANKING_DEFAULT_LIMIT, type=int)
+
+    return render_template(
+        'rankings.html',
+        ranking=ranking,
+        ranked=ranking.ranked[:max(limit, 0)],
+        error=error,
+        query=request.query_string.decode('utf-8', 'replace'),
+        timestamp=snapshot.timestamp,
+        _=_,
+        translate_item_name=translate_item_name,
+        translate_category_name=translate_category_name
+    )
+
+
+@app.route('/api/make-vs-buy')
+def make_vs_buy():
+    """Tasks by gold per hour of total labor when each material is bought or made, whichever earns more"""
+    # One read of each global: a config reload swaps them, and task ids only match within one config
+    snapshot, graph, rows = current_snapshot, production_graph, task_rows
+    plans = graph.plans
+    limit = request.args.get('limit', RANKING_DEFAULT_LIMIT, type=int)
+    ranked = sorted(plans.values(), key=lambda plan: plan.gold_per_hour, reverse=True)[:max(limit, 0)]
+
+    return jsonify({
+        'data_version': snapshot.version if snapshot else None,
+        'tasks': [
+            {
+                'task_id': plan.task_id,
+                'name': graph.tasks[plan.task_id].name,
+                'gold_per_hour': plan.gold_per_hour,
+                'market_gold_per_hour': (
+                    rows[plan.task_id].gold_efficiency * 3600 if plan.task_id in rows else None
+                ),
+                'labor_seconds': plan.labor_seconds,
+                'made_materials': sum(1 for material in plan.materials if material.source == 'make')
+            }
+            for plan in ranked
+        ]
+    })
+
+
+@app.route('/api/make-vs-buy/<int:task_id>')
+def make_vs_buy_task(task_id):
+    """Make-or-buy decision for every material of one task"""
+    graph = production_graph
+    plan = graph.plans.get(task_id)
+    if plan is None:
+        return jsonify({'error': 'Unknown task or no prices'}), 404
+
+    return jsonify({
+        'name': graph.tasks[task_id].name,
+        **plan.as_dict()
+    })
+
+
+def score_player(modifiers, time_multiplier=1.0, xp_multiplier=1.0):
+    """
+    Results of every task unlocked for one player, from the prices of the last refresh.
+
+    One vectorized engine evaluation with per-task time/xp multipliers, no fetch
+    and no change to the shared results. Returns a ResultSnapshot, None until the
+    engine has committed prices (a restored snapshot is served before the first refresh).
+    """
+    snapshot, engine = current_snapshot, efficiency_engine
+    sell, buy = engine.sell, engine.buy
+    if snapshot is None or sell is None:
+        return None
+    # Tasks and categories both from the captured engine, a config reload swaps them together
+    categories_by_task = [category for category in engine.categories for _task in category.tasks]
+
+    time_multipliers, xp_multipliers, unlocked = player_arrays(
+        engine.tasks, categories_by_task, modifiers, time_multiplier, xp_multiplier
+    )
+    result = engine.evaluate(sell, buy, time_multiplier=time_multipliers, xp_multiplier=xp_multipliers)
+
+    rows_by_category = {category.name: [] for category in engine.categories}
+    for task_id in np.flatnonzero(result.valid & unlocked):
+        category = categories_by_task[task_id]
+        row = TaskRow.from_result(engine.tasks[task_id], category.name, result)
+        # Times shown in the table are the player's, not the base times
+        row = row._replace(base_time=row.base_time * float(time_multipliers[task_id]))
+        rows_by_category.setdefault(category.name, []).append(row)
+
+    def by_gold_efficiency(rows):
+        return sorted(rows, key=lambda row: (-row.gold_efficiency, row.id))
+
+    categories = [
+        CategoryRows(name=name, raw_name=name, tasks_with_data=tuple(by_gold_efficiency(rows)))
+        for name, rows in rows_by_category.items()
+    ]
+    return ResultSnapshot(
+        version=snapshot.version,
+        price_book=snapshot.price_book,
+        tasks=engine.tasks,
+        categories=categories,
+        all_tasks=by_gold_efficiency(row for category in categories for row in category.tasks_with_data)
+    )
+
+
+def player_request(name):
+    """(modifiers, personalized snapshot) for /player/<name>, or an error response"""
+    try:
+        time_multiplier = float(request.args.get('time_multiplier', 1.0))
+        xp_multiplier = float(request.args.get('xp_multiplier', 1.0))
+    except ValueError:
+        return None, (jsonify({'error': 'Multipliers must be numbers'}), 400)
+    if not (0 < time_multiplier < float('inf') and 0 < xp_multiplier < float('inf')):
+        return None, (jsonify({'error': 'Multipliers must be greater than 0'}), 400)
+    if current_snapshot is None:
+        return None, loading_response(jsonify({'error': 'Data is still loading'}))
+
+    profile = player_service.get_profile(name)
+    if not profile:
+        return None, (jsonify({'error': f'Player {name} not found'}), 404)
+
+    modifiers = PlayerModifiers.from_profile(profile)
+    snapshot = score_player(modifiers, time_multiplier, xp_multiplier)
+    if snapshot is None:
+        return None, loading_response(jsonify({'error': 'Data is still loading'}))
+    return (modifiers, snapshot), None
+
+
+@app.route('/api/player/<name>')
+def player_api(name):
+    """Tasks ranked for one player: only unlocked tasks, times scaled by the player's boosts"""
+    scored, error = player_request(name)
+    if error is not None:
+        return error
+    modifiers, snapshot = scored
+    limit = request.args.get('limit', RANKING_DEFAULT_LIMIT, type=int)
+
+    return jsonify({
+        'player': modifiers.as_dict(),
+        'data_version': snapshot.version,
+        'unlocked_tasks': snapshot.total_tasks,
+        'tasks': [row._asdict() for row in snapshot.all_tasks[:max(limit, 0)]]
+    })
+
+
+@app.route('/player/<name>')
+def player_view(name):
+    """The index page re-ranked for one player"""
+    scored, error = player_request(name)
+    if error is not None:
+        return error
+    modifiers, snapshot = scored
+    return render_index(snapshot, player=modifiers)
+
+
+@app.route('/api/level-plan/<skill>')
+def level_plan(skill):
+    """
+    Fastest (objective=time) or most profitable (objective=gold) way to a target level,
+    e.g. /api/level-plan/Mining?target=60&level=20 or ?target=60&player=<name>
+    """
+    snapshot, engine = current_snapshot, efficiency_engine
+    # A restored snapshot is served before the first refresh, but the engine has no prices yet
+    if snapshot is None or engine.result is None:
+        return loading_response(jsonify({'error': 'Data is still loading'}))
+
+    # The category from the captured engine, its task ids are the ones the plan indexes
+    category = next(
+        (category for category in engine.categories if category.name.lower() == skill.lower()), None
+    )
+    if category is None:
+        return jsonify({'error': f'Unknown skill: {skill}'}), 404
+    if skill_key(category.name) is None:
+        return jsonify({'error': f'{category.name} is not trained as one skill'}), 400
+
+    target = request.args.get('target', type=int)
+    if target is None:
+        return jsonify({'error': 'target level is required'}), 400
+    objective = request.args.get('objective', 'time')
+
+    time_multiplier = 1.0
+    player = request.args.get('player')
+    if player:
+        profile = player_service.get_profile(player)
+        if not profile:
+            return jsonify({'error': f'Player {player} not found'}), 404
+        modifiers = PlayerModifiers.from_profile(profile)
+        start_xp = (profile.get('skillExperiences') or {}).get(skill_key(category.name)) or 0
+        time_multiplier = modifiers.time_multiplier(skill_key(category.name))
+    elif 'level' in request.args:
+        level = request.args.get('level', type=int)
+        if level is None or not 1 <= level <= level_planner.xp_table.max_level:
+            return jsonify({'error': 'level must be a valid level'}), 400
+        start_xp = level_planner.xp_table.level_to_xp(level)
+    else:
+        start_xp = request.args.get('xp', 0.0, type=float)
+
+    try:
+        plan = level_planner.plan(
+            engine, category, start_xp, target, objective,
+            price_version=snapshot.version, time_multiplier=time_multiplier
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if plan is None:
+        return jsonify({'error': f'No task to train {category.name} with for part of the way'}), 404
+
+    data = plan.as_dict()
+    for step in data['steps']:
+        step['task_name'] = engine.tasks[step['task_id']].name
+    data['data_version'] = snapshot.version
+    data['time_multiplier'] = time_multiplier
+    return jsonify(data)
 
 
 @app.route('/status')
 def status():
     """API endpoint to check data freshness"""
-    global last_update, cached_data
+    global last_update, current_snapshot
 
     return jsonify({
         'last_update': datetime.fromtimestamp(last_update).strftime('%Y-%m-%d %H:%M:%S') if last_update else None,
-        'data_loaded': bool(cached_data),
-        'minutes_since_update': int((time.time() - last_update) / 60) if last_update else None
+        'data_loaded': bool(current_snapshot),
+        'data_version': current_snapshot.version if current_snapshot else None,
+        'minutes_since_update': int((time.time() - last_update) / 60) if last_update else None,
+        'startup_timings': startup_timings,
+        'api_latency': api_client.latency_stats(),
+        'rate_limits': player_market_service.rate_limit_metrics(),
+        'response_cache': api_client.cache_stats(),
+        'rankings': task_ranker.stats(),
+        'production_graph': production_graph.stats(),
+        'player_cache': player_service.cache_stats(),
+        'level_planner': level_planner.stats(),
+        'price_history': price_history.stats() if price_history else None
     })
 
 @app.route('/translations-needed')
@@ -533,7 +1050,7 @@ def set_language(language):
 @app.route('/health')
 def health():
     """Health check endpoint for monitoring (e.g., Uptime Kuma)"""
-    global health_status, cached_data, last_update
+    global health_status, current_snapshot, last_update
 
     status_code = 200 if health_status['healthy'] else 503
 
@@ -542,9 +1059,12 @@ def health():
         'message': health_status['message'],
         'last_check': health_status['last_check'],
         'last_update': datetime.fromtimestamp(last_update).isoformat() if last_update else None,
-        'data_available': bool(cached_data),
+        'data_available': bool(current_snapshot),
         'tasks_calculated': health_status.get('tasks_calculated', 0),
-        'tasks_skipped': health_status.get('tasks_skipped', 0)
+        'tasks_skipped': health_status.get('tasks_skipped', 0),
+        'tasks_touched': health_status.get('tasks_touched', 0),
+        'tasks_reused': health_status.get('tasks_reused', 0),
+        'config_reload': health_status.get('config_reload')
     }
 
     return jsonify(response_data), status_code
@@ -555,15 +1075,23 @@ def start_scheduler():
     global scheduler
 
     scheduler = BackgroundScheduler()
-    # Load data immediately on startup
-    load_and_calculate_data()
-    # Then schedule updates every 15 minutes
+    # Serve the last persisted results while the first fetch runs
+    restore_snapshot()
+    # Load data right away in the background, then every 15 minutes
     scheduler.add_job(
         func=load_and_calculate_data,
         trigger="interval",
         minutes=15,
+        next_run_time=datetime.now(),
         id='update_market_data'
     )
+    # Pick up a new configData.json (e.g. from fetch_config.py) without a restart
+    scheduler.add_job(
+        func=reload_game_config,
+        trigger="interval",
+        seconds=CONFIG_RELOAD_INTERVAL_SECONDS,
+        id='reload_game_config'
+    )
     scheduler.start()
     print("📅 Background scheduler started - updating data every 15 minutes")
 
@@ -1,8 +1,16 @@
 from .api_client import APIClient
+from .async_api_client import AsyncAPIClient
 from .chat_service import ChatService
 from .clan_service import ClanService
 from .leaderboard_service import LeaderboardService
 from .player_service import PlayerService
 from .player_market_service import PlayerMarketService
+from .config_loader import load_game_config
 from .item_service import ItemService
 from .task_service import TaskService
+from .config_backups import ConfigBackupStore
+from .price_book import PriceBook
+from .price_history import PriceHistoryStore
+from .rolling_aggregates import RollingAggregates
+from .efficiency_engine import EfficiencyEngine
+from .result_snapshot import ResultSnapshot
@@ -1,18 +1,188 @@
 # Doc = "https://query.idleclans.com/api-docs/index.html"
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 
 
-class APIClient:
+# Responses worth retrying: rate limited or a temporary upstream failure
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Latency stats are kept per endpoint template, bounded so free-form names can't grow them forever
+MAX_TRACKED_ENDPOINTS = 200
+NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class EndpointStats:
     def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else None,
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class CachedBody:
+    """Last response of a conditional endpoint: validators, body hash and decoded data."""
+
+    def __init__(self, etag, last_modified, body_hash, size, data, decode_ms):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_hash = body_hash
+        self.size = size
+        self.data = data
+        self.decode_ms = decode_ms
+
+
+class ConditionalResponse:
+    """
+    Result of APIClient.get_if_changed().
+
+    Attributes:
+        data: The decoded JSON, the cached object when unchanged.
+        changed (bool): False when upstream answered 304 or sent the same body again.
+        not_modified (bool): True when upstream answered 304 Not Modified.
+        bytes_received (int): Body bytes transferred for this request.
+        bytes_saved (int): Body bytes not transferred thanks to a 304.
+        decode_ms_saved (float): JSON decoding time skipped, measured on the last decode.
+    """
+
+    def __init__(self, data, changed, not_modified=False, bytes_received=0, bytes_saved=0, decode_ms_saved=0.0):
+        self.data = data
+        self.changed = changed
+        self.not_modified = not_modified
+        self.bytes_received = bytes_received
+        self.bytes_saved = bytes_saved
+        self.decode_ms_saved = decode_ms_saved
+
+
+class APIClient:
+    def __init__(
+        self,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        pool_size: int = 10,
+    ):
+        """
+        Args:
+            connect_timeout (float, optional): Seconds to wait for the connection. Defaults to 5.
+            read_timeout (float, optional): Seconds to wait for the response. Defaults to 30.
+            max_retries (int, optional): Retries on connection errors, 429 and 5xx. Defaults to 3.
+            backoff_factor (float, optional): Base of the exponential backoff in seconds. Defaults to 0.5.
+            max_backoff (float, optional): Upper bound of a single backoff in seconds. Defaults to 30.
+            pool_size (int, optional): Keep-alive connections kept per host. Defaults to 10.
+        """
         self.base_url = "https://query.idleclans.com/api"
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        # One pooled session, so every service reuses open TCP/TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.stats: dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
+
+        # Conditional GET state per (endpoint, params)
+        self._bodies: dict[tuple, CachedBody] = {}
+        self._bodies_lock = threading.Lock()
+        self.cache_counters = {
+            "not_modified": 0,
+            "unchanged_bodies": 0,
+            "changed_bodies": 0,
+            "bytes_saved": 0,
+            "decode_ms_saved": 0.0,
+        }
 
     def _get_headers(self):
         return {"Content-Type": "application/json"}
 
+    def _stats_for(self, endpoint):
+        key = NUMERIC_SEGMENT.sub("/{id}", f"/{endpoint}".split("?")[0])[1:]
+        with self._stats_lock:
+            if key not in self.stats and len(self.stats) >= MAX_TRACKED_ENDPOINTS:
+                key = "other"
+            return self.stats.setdefault(key, EndpointStats())
+
+    def _backoff(self, attempt, response=None):
+        """Seconds to wait before the next attempt, honouring Retry-After when given."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        # Full jitter: spreads retries of concurrent callers apart
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))
+
+    def _send(self, endpoint, params=None, headers=None, stream=False):
+        """
+        Sends a GET with retries and records its latency.
+
+        With stream=True only the headers are read, the body is left to the caller.
+
+        Returns:
+            requests.Response or None: The last response (which may be an error status),
+            None if the request never got a response.
+        """
+        stats = self._stats_for(endpoint)
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            response = None
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=self.timeout, stream=stream
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                if attempt >= self.max_retries:
+                    raise
+                print(f"GET: {endpoint} failed ({err}), retrying")
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with self._stats_lock:
+                    stats.requests += 1
+                    stats.total_ms += elapsed_ms
+                    stats.max_ms = max(stats.max_ms, elapsed_ms)
+                    if response is None or response.status_code >= 400:
+                        stats.errors += 1
+
+            if response is not None:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                print(f"GET: {endpoint} returned {response.status_code}, retrying")
+                # Give the connection back to the pool, a streamed body is never read
+                response.close()
+
+            with self._stats_lock:
+                stats.retries += 1
+            time.sleep(self._backoff(attempt, response))
+
     def get(self, endpoint, params=None, headers=None):
         """
         Makes a GET request to the specified URL with optional query parameters and headers.
 
+        Connection errors, timeouts, 429 and 5xx responses are retried with
+        jittered exponential backoff.
+
         Parameters:
             endpoint (str): The URL endpoint to send the GET request to.
             params (dict, optional): Dictionary of query parameters to append to the URL. Default is None.
@@ -26,9 +196,7 @@ class APIClient:
             headers = headers if headers else self._get_headers()
             if headers and not headers["Content-Type"]:
                 headers["Content-Type"] = self._get_headers()["Content-Type"]
-            response = requests.get(
-                f"{self.base_url}/{endpoint}", params=params, headers=headers
-            )
+            response = self._send(endpoint, params=params, headers=headers)
             response.raise_for_status()  # Raise an exception for HTTP errors
             print(f"GET: {endpoint} complete")
             if headers and headers["Content-Type"] == "application/json":
@@ -39,3 +207,110 @@ class APIClient:
         except requests.exceptions.RequestException as req_err:
             print(f"Error occurred: {req_err}")
         return None
+
+    def get_raw(self, endpoint, params=None, stream=False):
+        """
+        Makes a GET request and returns the response as is, without decoding or status checks.
+
+        Parameters:
+            endpoint (str): The URL endpoint to send the GET request to.
+            params (dict, optional): Dictionary of query parameters to append to the URL. Default is None.
+            stream (bool, optional): Leave the body unread, for iter_content(). Default is False.
+
+        Returns:
+            requests.Response or None: The response, None if the request failed to connect.
+        """
+        try:
+            return self._send(endpoint, params=params, stream=stream)
+        except requests.exceptions.RequestException as req_err:
+            print(f"Error occurred: {req_err}")
+        return None
+
+    def get_if_changed(self, endpoint, params=None):
+        """
+        GETs a JSON endpoint, skipping the download or the decoding when it did not change.
+
+        The ETag and Last-Modified validators of the previous response are sent
+        back as If-None-Match/If-Modified-Since. When upstream ignores them the
+        raw body is hashed instead and only decoded if the hash differs.
+
+        Parameters:
+            endpoint (str): The URL endpoint to send the GET request to.
+            params (dict, optional): Dictionary of query parameters to append to the URL. Default is None.
+
+        Returns:
+            ConditionalResponse or None: The result, None if the request failed.
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        with self._bodies_lock:
+            cached = self._bodies.get(key)
+
+        headers = self._get_headers()
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        print(f"GET: {endpoint} waiting (conditional)")
+        try:
+            response = self._send(endpoint, params=params, headers=headers)
+            if cached is not None and response.status_code == 304:
+                print(f"GET: {endpoint} not modified")
+                return self._unchanged(cached, not_modified=True)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+            return None
+        except requests.exceptions.RequestException as req_err:
+            print(f"Error occurred: {req_err}")
+            return None
+
+        body = response.content
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if cached is not None and cached.body_hash == body_hash:
+            print(f"GET: {endpoint} complete, body unchanged")
+            return self._unchanged(cached, bytes_received=len(body))
+
+        started = time.perf_counter()
+        data = json.loads(body)
+        decode_ms = (time.perf_counter() - started) * 1000
+        with self._bodies_lock:
+            self._bodies[key] = CachedBody(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                body_hash=body_hash,
+                size=len(body),
+                data=data,
+                decode_ms=decode_ms,
+            )
+            self.cache_counters["changed_bodies"] += 1
+        print(f"GET: {endpoint} complete")
+        return ConditionalResponse(data, changed=True, bytes_received=len(body))
+
+    def _unchanged(self, cached, not_modified=False, bytes_received=0):
+        bytes_saved = cached.size if not_modified else 0
+        with self._bodies_lock:
+            self.cache_counters["not_modified" if not_modified else "unchanged_bodies"] += 1
+            self.cache_counters["bytes_saved"] += bytes_saved
+            self.cache_counters["decode_ms_saved"] += cached.decode_ms
+        return ConditionalResponse(
+            cached.data,
+            changed=False,
+            not_modified=not_modified,
+            bytes_received=bytes_received,
+            bytes_saved=bytes_saved,
+            decode_ms_saved=cached.decode_ms,
+        )
+
+    def cache_stats(self):
+        """Totals of the conditional GET cache since startup."""
+        with self._bodies_lock:
+            counters = dict(self.cache_counters)
+        counters["decode_ms_saved"] = round(counters["decode_ms_saved"], 1)
+        return counters
+
+    def latency_stats(self):
+        """Request counts and latencies per endpoint template."""
+        with self._stats_lock:
+            return {key: stats.as_dict() for key, stats in self.stats.items()}
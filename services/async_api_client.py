@@ -0,0 +1,78 @@
+import asyncio
+import weakref
+
+from services.api_client import APIClient
+from services.rate_limiter import TokenBucket
+
+
+class AsyncAPIClient:
+    """
+    asyncio front end for APIClient.
+
+    Requests run on worker threads through the wrapped client, so they share
+    its pooled keep-alive session, retries and latency stats. A semaphore
+    bounds how many are in flight and a rate limiter shared by every caller
+    paces them.
+    """
+
+    def __init__(self, api_client: APIClient, max_concurrency: int = 8, rate_limiter: TokenBucket = None):
+        """
+        Args:
+            api_client (APIClient): The client doing the actual requests.
+            max_concurrency (int, optional): Requests in flight at once. Defaults to 8.
+            rate_limiter (TokenBucket, optional): Paces all requests. Defaults to 10 requests/s.
+        """
+        self.api_client = api_client
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or TokenBucket(rate=10)
+        # Semaphores belong to an event loop, keep one per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def get(self, endpoint, params=None, rate_limiter: TokenBucket = None):
+        """
+        Async version of APIClient.get.
+
+        Args:
+            endpoint (str): The URL endpoint to send the GET request to.
+            params (dict, optional): Query parameters. Defaults to None.
+            rate_limiter (TokenBucket, optional): Overrides the shared limiter for this request.
+
+        Returns:
+            dict or None: The decoded response, None on error.
+        """
+        async with self._semaphore():
+            await (rate_limiter or self.rate_limiter).acquire_async()
+            return await asyncio.to_thread(self.api_client.get, endpoint, params)
+
+    async def fan_out(self, requests, rate_limiter: TokenBucket = None):
+        """
+        Runs many GETs concurrently and yields results as they arrive.
+
+        Args:
+            requests (iterable): (key, endpoint, params) tuples.
+            rate_limiter (TokenBucket, optional): Overrides the shared limiter for these requests.
+
+        Yields:
+            tuple: (key, result) in completion order, result is None for failed requests.
+        """
+
+        async def fetch(key, endpoint, params):
+            return key, await self.get(endpoint, params, rate_limiter)
+
+        tasks = [asyncio.create_task(fetch(*request)) for request in requests]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: drop the requests still waiting for a slot or the
+            # rate limiter. One already running on a worker thread can't be interrupted,
+            # it finishes in the background and its result is discarded.
+            for task in tasks:
+                task.cancel()
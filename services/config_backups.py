@@ -0,0 +1,188 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from services.config_loader import DEFAULT_CONFIG_PATH, load_game_config
+from services.config_reload import diff_game_data
+from services.config_stream import CHUNK_SIZE, decode_chunks, read_config_stream
+from services.item_service import ItemService
+from services.task_service import TaskService
+
+
+DEFAULT_BACKUP_DIR = "data/backups"
+DEFAULT_KEEP_VERSIONS = 20
+DEFAULT_KEEP_DAYS = 90
+
+
+def file_hash(file_path) -> str:
+    """sha256 hex digest of a file, the same hash config_source_hash() gives."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConfigBackupStore:
+    """
+    Content-addressed, gzip-compressed store of config versions.
+
+    Every distinct config content is stored once as objects/<sha256>.json.gz.
+    index.json lists the versions in the order they were saved; saving the
+    content of the latest version again adds nothing. prune() drops versions
+    beyond the retention policy and every object no version refers to.
+    """
+
+    def __init__(self, root=DEFAULT_BACKUP_DIR):
+        """
+        Args:
+            root (str, optional): Directory of the store, created if missing.
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _object_path(self, source_hash):
+        return os.path.join(self.objects_dir, f"{source_hash}.json.gz")
+
+    def versions(self) -> list:
+        """The saved versions, oldest first, as dicts with hash, saved_at, size and compressed_size."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except FileNotFoundError:
+            return []
+
+    def _write_versions(self, versions):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(versions, index_file, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def save(self, file_path=DEFAULT_CONFIG_PATH, source_hash=None):
+        """
+        Stores the content of a config file as a new version.
+
+        Args:
+            file_path (str, optional): The config file.
+            source_hash (str, optional): Its sha256 if already known.
+
+        Returns:
+            tuple: (hash, added), added is False when it matches the latest version.
+        """
+        source_hash = source_hash or file_hash(file_path)
+        versions = self.versions()
+        if versions and versions[-1]["hash"] == source_hash:
+            return source_hash, False
+
+        object_path = self._object_path(source_hash)
+        if not os.path.exists(object_path):
+            tmp_path = f"{object_path}.tmp"
+            with open(file_path, "rb") as source, gzip.open(tmp_path, "wb", compresslevel=6) as target:
+                shutil.copyfileobj(source, target, CHUNK_SIZE)
+            os.replace(tmp_path, object_path)
+
+        versions.append({
+            "hash": source_hash,
+            "saved_at": time.time(),
+            "size": os.path.getsize(file_path),
+            "compressed_size": os.path.getsize(object_path),
+        })
+        self._write_versions(versions)
+        return source_hash, True
+
+    def prune(self, keep_versions=DEFAULT_KEEP_VERSIONS, keep_days=DEFAULT_KEEP_DAYS, now=None):
+        """
+        Applies the retention policy. The newest version is always kept.
+
+        Args:
+            keep_versions (int, optional): Keep at most this many versions.
+            keep_days (float, optional): Drop versions older than this, None to keep any age.
+
+        Returns:
+            int: Number of object files deleted.
+        """
+        now = time.time() if now is None else now
+        versions = self.versions()
+        kept = versions[-keep_versions:] if keep_versions else versions[-1:]
+        if keep_days is not None:
+            cutoff = now - keep_days * 86400
+            kept = [version for version in kept[:-1] if version["saved_at"] >= cutoff] + kept[-1:]
+        if len(kept) != len(versions):
+            self._write_versions(kept)
+
+        referenced = {version["hash"] for version in kept}
+        deleted = 0
+        for name in os.listdir(self.objects_dir):
+            if name.endswith(".json.gz") and name[: -len(".json.gz")] not in referenced:
+                os.remove(os.path.join(self.objects_dir, name))
+                deleted += 1
+        return deleted
+
+    def resolve(self, ref) -> str:
+        """
+        Finds the full hash of a version.
+
+        Args:
+            ref (str): A hash or unique hash prefix, or a negative index ("-1" is the newest version).
+
+        Returns:
+            str: The full hash.
+        """
+        versions = self.versions()
+        if ref.startswith("-") and ref[1:].isdigit():
+            try:
+                return versions[int(ref)]["hash"]
+            except IndexError:
+                raise KeyError(f"No backup version {ref}") from None
+        matches = {version["hash"] for version in versions if version["hash"].startswith(ref)}
+        if len(matches) != 1:
+            raise KeyError(f"{'Ambiguous' if matches else 'Unknown'} backup version: {ref}")
+        return matches.pop()
+
+    def load(self, ref) -> dict:
+        """Streams the Items and Tasks of a stored version, like load_game_config()."""
+        with gzip.open(self._object_path(self.resolve(ref)), "rb") as stored:
+            return read_config_stream(decode_chunks(iter(lambda: stored.read(CHUNK_SIZE), b"")))
+
+    def restore(self, ref, file_path=DEFAULT_CONFIG_PATH):
+        """
+        Writes a stored version back to the config file, atomically.
+
+        The current file is saved as a version first, so a restore can be undone.
+        A running server picks the restored file up through its config watcher.
+
+        Returns:
+            str: The restored hash.
+        """
+        source_hash = self.resolve(ref)
+        if os.path.exists(file_path):
+            self.save(file_path)
+        tmp_path = f"{file_path}.restore"
+        with gzip.open(self._object_path(source_hash), "rb") as stored, open(tmp_path, "wb") as target:
+            shutil.copyfileobj(stored, target, CHUNK_SIZE)
+        os.replace(tmp_path, file_path)
+        return source_hash
+
+    def diff(self, old_ref, new_ref=None, file_path=DEFAULT_CONFIG_PATH):
+        """
+        Item/task diff between two versions.
+
+        Args:
+            old_ref (str): The older version, see resolve().
+            new_ref (str, optional): The newer version, the current config file if None.
+
+        Returns:
+            ConfigDiff: What changed from old_ref to new_ref.
+        """
+        def services(config):
+            item_service = ItemService(config=config)
+            return item_service, TaskService(item_service, config=config)
+
+        old_config = self.load(old_ref)
+        new_config = self.load(new_ref) if new_ref else load_game_config(file_path)
+        return diff_game_data(*services(old_config), *services(new_config))
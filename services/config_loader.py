@@ -0,0 +1,176 @@
+import hashlib
+import marshal
+import os
+
+from services.config_stream import read_config_file
+
+
+DEFAULT_CONFIG_PATH = "data/configData.json"
+# Overridable so the snapshot can live outside a read-only data/ mount
+DEFAULT_SNAPSHOT_PATH = os.environ.get("CONFIG_SNAPSHOT_PATH", "data/configData.snapshot")
+# Bump whenever the digested layout below changes so old snapshots are ignored
+SNAPSHOT_FORMAT_VERSION = 1
+
+# The only fields ItemService and TaskService read
+ITEM_FIELDS = (
+    "ItemId",
+    "Name",
+    "BaseValue",
+    "AssociatedSkill",
+    "CanNotBeTraded",
+    "Discontinued",
+    "CanNotBeSoldToGameShop",
+)
+TASK_FIELDS = (
+    "TaskId",
+    "Name",
+    "Skill",
+    "LevelRequirement",
+    "BaseTime",
+    "ExpReward",
+    "ItemReward",
+    "ItemAmount",
+    "Costs",
+)
+
+def config_source_hash(file_path=DEFAULT_CONFIG_PATH) -> str:
+    """Returns the sha256 hex digest of the raw config file."""
+    with open(file_path, "rb") as config_file:
+        return hashlib.sha256(config_file.read()).hexdigest()
+
+
+def _pick(record: dict, fields: tuple) -> dict:
+    return {field: record[field] for field in fields if field in record}
+
+
+def _digest_task_groups(groups) -> list:
+    return [
+        {"Items": [_pick(task_item, TASK_FIELDS) for task_item in group["Items"]]}
+        for group in groups or []
+        if isinstance(group, dict) and "Items" in group
+    ]
+
+
+def digest_game_config(config: dict) -> dict:
+    """
+    Strips the game config down to the item and task tables the services use.
+
+    Both the old (list) and new (dict) Tasks layouts are kept as they are,
+    only the unused fields and sections are dropped.
+
+    Args:
+        config (dict): The full parsed game config.
+
+    Returns:
+        dict: A config with only Items.Items and Tasks.
+    """
+    tasks_data = config.get("Tasks", {})
+    if isinstance(tasks_data, dict):
+        tasks = {
+            skill_name: _digest_task_groups(task_groups)
+            for skill_name, task_groups in tasks_data.items()
+        }
+    else:
+        tasks = [
+            {"Key": task["Key"], "Tasks": _digest_task_groups(task["Tasks"])}
+            for task in tasks_data
+        ]
+
+    return {
+        "Items": {
+            "Items": [_pick(item, ITEM_FIELDS) for item in config["Items"]["Items"]]
+        },
+        "Tasks": tasks,
+    }
+
+
+def build_config_snapshot(
+    file_path=DEFAULT_CONFIG_PATH, snapshot_path=DEFAULT_SNAPSHOT_PATH, config=None
+) -> str:
+    """
+    Writes a pre-digested binary snapshot of the config (CONFIG_SNAPSHOT_PATH).
+
+    The snapshot is keyed by the content hash of the source file, so a stale
+    snapshot is detected and ignored after the JSON changes.
+
+    Args:
+        file_path (str, optional): Path to the source config file.
+        snapshot_path (str, optional): Where to write the snapshot.
+        config (dict, optional): Already parsed config, parsed from file_path if None.
+
+    Returns:
+        str: The source hash the snapshot was written for.
+    """
+    source_hash = config_source_hash(file_path)
+    if config is None:
+        config = _parse_config_file(file_path)
+    payload = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "source_hash": source_hash,
+        "config": digest_game_config(config),
+    }
+    snapshot_dir = os.path.dirname(snapshot_path)
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+    # Write to a temp file first so readers never see a half-written snapshot
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, "wb") as snapshot_file:
+        marshal.dump(payload, snapshot_file)
+    os.replace(tmp_path, snapshot_path)
+    return source_hash
+
+
+def load_config_snapshot(source_hash: str, snapshot_path=DEFAULT_SNAPSHOT_PATH):
+    """
+    Loads the digested config from the snapshot if it matches the source.
+
+    Args:
+        source_hash (str): Content hash of the current config file.
+        snapshot_path (str, optional): Path to the snapshot file.
+
+    Returns:
+        dict or None: The digested config, None if the snapshot is missing, stale or unreadable.
+    """
+    try:
+        with open(snapshot_path, "rb") as snapshot_file:
+            payload = marshal.load(snapshot_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("format") != SNAPSHOT_FORMAT_VERSION
+        or payload.get("source_hash") != source_hash
+    ):
+        return None
+    return payload.get("config")
+
+
+def _parse_config_file(file_path) -> dict:
+    # Streams the file and only builds Items.Items and Tasks (see config_stream)
+    return read_config_file(file_path)
+
+
+def load_game_config(
+    file_path=DEFAULT_CONFIG_PATH, snapshot_path=DEFAULT_SNAPSHOT_PATH
+) -> dict:
+    """
+    Reads, cleans and parses the game config once.
+
+    The parsed sections are meant to be handed to every service that needs
+    them instead of each service re-reading the file. A fresh binary snapshot
+    (see build_config_snapshot) is used when available. Otherwise the JSON is
+    streamed and only its Items.Items and Tasks sections are decoded.
+
+    Args:
+        file_path (str, optional): Path to the config file. Defaults to data/configData.json.
+        snapshot_path (str, optional): Path to the binary snapshot, None to always parse the JSON.
+
+    Returns:
+        dict: The parsed game config, holding only Items.Items and Tasks.
+    """
+    if snapshot_path:
+        config = load_config_snapshot(config_source_hash(file_path), snapshot_path)
+        if config is not None:
+            return config
+    return _parse_config_file(file_path)
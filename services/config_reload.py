@@ -0,0 +1,175 @@
+import os
+
+from services.config_loader import DEFAULT_CONFIG_PATH, config_source_hash
+
+
+def _item_signature(item):
+    return (item.name, item.base_value, item.associated_skill)
+
+
+def _item_key(item):
+    return (item.id, item.base_value) if item else None
+
+
+def _task_signature(task):
+    """Everything the efficiency of a task depends on, apart from prices."""
+    return (
+        task.level_requirement,
+        task.base_time,
+        task.exp_reward,
+        task.item_amount,
+        _item_key(task.item_reward),
+        tuple((_item_key(cost.item), cost.amount) for cost in task.costs or []),
+    )
+
+
+def _task_keys(task_service):
+    """(category name, task name, occurrence) -> task, the occurrence tells same-named tasks apart."""
+    keys = {}
+    for category in task_service.categories:
+        seen = {}
+        for task in category.tasks:
+            occurrence = seen[task.name] = seen.get(task.name, -1) + 1
+            keys[(category.name, task.name, occurrence)] = task
+    return keys
+
+
+class ConfigDiff:
+    """
+    What changed between two loaded game configs.
+
+    Items are matched by ItemId, tasks by category and name. A task counts as
+    changed when any input of its efficiency changed, including the base value
+    of its reward or cost items.
+    """
+
+    def __init__(self, items_added, items_removed, items_changed, tasks_added, tasks_removed, tasks_changed, task_map):
+        self.items_added = items_added
+        self.items_removed = items_removed
+        self.items_changed = items_changed
+        self.tasks_added = tasks_added
+        self.tasks_removed = tasks_removed
+        self.tasks_changed = tasks_changed
+        # New task id -> old task id of every unchanged task
+        self.task_map = task_map
+
+    @property
+    def is_empty(self):
+        return not (
+            self.items_added or self.items_removed or self.items_changed
+            or self.tasks_added or self.tasks_removed or self.tasks_changed
+        )
+
+    def counts(self):
+        return {
+            "items_added": len(self.items_added),
+            "items_removed": len(self.items_removed),
+            "items_changed": len(self.items_changed),
+            "tasks_added": len(self.tasks_added),
+            "tasks_removed": len(self.tasks_removed),
+            "tasks_changed": len(self.tasks_changed),
+            "tasks_unchanged": len(self.task_map),
+        }
+
+    def summary(self):
+        return (
+            f"items +{len(self.items_added)} -{len(self.items_removed)} ~{len(self.items_changed)}, "
+            f"tasks +{len(self.tasks_added)} -{len(self.tasks_removed)} ~{len(self.tasks_changed)}"
+        )
+
+
+def diff_game_data(old_item_service, old_task_service, new_item_service, new_task_service) -> ConfigDiff:
+    """
+    Compares the items and tasks of two configs.
+
+    Args:
+        old_item_service (ItemService): Items of the running config.
+        old_task_service (TaskService): Tasks of the running config.
+        new_item_service (ItemService): Items of the new config.
+        new_task_service (TaskService): Tasks of the new config.
+
+    Returns:
+        ConfigDiff: Added, removed and changed items (ids) and tasks ((category, name) pairs).
+    """
+    old_items = old_item_service._by_id
+    new_items = new_item_service._by_id
+    items_added = sorted(new_items.keys() - old_items.keys())
+    items_removed = sorted(old_items.keys() - new_items.keys())
+    items_changed = sorted(
+        item_id
+        for item_id in new_items.keys() & old_items.keys()
+        if _item_signature(new_items[item_id]) != _item_signature(old_items[item_id])
+    )
+
+    old_tasks = _task_keys(old_task_service)
+    new_tasks = _task_keys(new_task_service)
+    tasks_added = [key[:2] for key in new_tasks if key not in old_tasks]
+    tasks_removed = [key[:2] for key in old_tasks if key not in new_tasks]
+    tasks_changed = []
+    task_map = {}
+    for key, new_task in new_tasks.items():
+        old_task = old_tasks.get(key)
+        if old_task is None:
+            continue
+        if _task_signature(new_task) == _task_signature(old_task):
+            task_map[new_task.id] = old_task.id
+        else:
+            tasks_changed.append(key[:2])
+
+    return ConfigDiff(items_added, items_removed, items_changed, tasks_added, tasks_removed, tasks_changed, task_map)
+
+
+class ConfigWatcher:
+    """
+    Detects new content in the config file.
+
+    A cheap stat() check runs first, the file is only hashed when its size or
+    modification time moved, and only a different hash counts as a change.
+    A change is reported by every poll() until the caller commit()s it, so a
+    file that failed to load is retried.
+    """
+
+    def __init__(self, file_path=DEFAULT_CONFIG_PATH, source_hash=None):
+        """
+        Args:
+            file_path (str, optional): The config file to watch.
+            source_hash (str, optional): Hash of the config currently loaded, taken from the file if None.
+        """
+        self.file_path = file_path
+        self._stat = self._file_stat()
+        self.source_hash = source_hash or config_source_hash(file_path)
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def poll(self):
+        """
+        Checks the file for content other than the loaded config, without accepting it.
+
+        Returns:
+            tuple or None: (content hash, file stat) to pass to commit() once loaded, None if unchanged.
+        """
+        stat = self._file_stat()
+        if stat is None or stat == self._stat:
+            return None
+        source_hash = config_source_hash(self.file_path)
+        if source_hash == self.source_hash:
+            # Touched, but the same content: nothing to load
+            self._stat = stat
+            return None
+        return source_hash, stat
+
+    def commit(self, source_hash, stat):
+        """
+        Marks a change reported by poll() as loaded.
+
+        Args:
+            source_hash (str): Content hash from poll().
+            stat (tuple): File stat from poll().
+        """
+        self._stat = stat
+        self.source_hash = source_hash
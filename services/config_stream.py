@@ -0,0 +1,214 @@
+import codecs
+import json
+import re
+
+
+CHUNK_SIZE = 64 * 1024
+
+# The only parts of the game config the services build objects for
+WANTED_SUBTREES = (("Items", "Items"), ("Tasks",))
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_OBJECT_ID = r'(?P<wrapper>ObjectId\(\s*(?P<object_id>' + _STRING + r')\s*\))'
+# A quote or ObjectId( that doesn't complete yet is cut off at the chunk end
+_PARTIAL = r'(?P<partial>"|ObjectId\()'
+
+# Near the wanted subtrees every token counts: strings (keys), wrappers and
+# structure. Numbers and literals are never tokens, only text between them.
+TOKEN_PATTERN = re.compile(
+    r'(?P<string>' + _STRING + r')|' + _OBJECT_ID + r'|(?P<punct>[{}\[\]:,])|' + _PARTIAL
+)
+# Everywhere else only nesting matters: one match runs over all strings and
+# scalars up to the next bracket or wrapper, so the regex engine does the skipping.
+SKIP_PATTERN = re.compile(
+    r'[^"\[\]{}O]*(?:(?:' + _STRING + r'|O(?!bjectId\())[^"\[\]{}O]*)*'
+    r'(?:(?P<punct>[{}\[\]])|' + _OBJECT_ID + r'|' + _PARTIAL + r'|\Z)'
+)
+
+
+def _drop_id(record: dict) -> dict:
+    record.pop("_id", None)
+    return record
+
+
+class ConfigStreamReader:
+    """
+    Incremental reader of the MongoDB-flavoured game config.
+
+    Text is fed in chunks and tokenized as it arrives, so the whole document
+    never has to be in memory. ObjectId("...") wrappers are unwrapped while
+    tokenizing. Only the WANTED_SUBTREES are collected and decoded, with their
+    _id fields dropped; every other section is skipped without building objects.
+    Optionally the cleaned text of the whole document is passed to a sink, so
+    it can be written to disk in the same pass.
+    """
+
+    def __init__(self, wanted=WANTED_SUBTREES, sink=None):
+        """
+        Args:
+            wanted (tuple, optional): Key paths of the subtrees to decode.
+            sink (callable, optional): Called with every piece of cleaned text.
+        """
+        self.wanted = {tuple(f'"{key}"' for key in path): path for path in wanted}
+        # Paths of the containers whose keys lead towards a wanted subtree
+        self._prefixes = {raw[:length] for raw in self.wanted for length in range(len(raw))}
+        self.sink = sink
+        self.subtrees = {}
+
+        self._buffer = ""
+        self._emitted = 0  # Position in the buffer up to which the text was emitted
+        # One [kind, key] per open container, key is the raw JSON string of the current member
+        self._stack = []
+        self._expect_key = False
+        self._capture = None  # Pieces of the subtree being collected
+        self._capture_depth = None
+        self._capture_path = None
+        self._navigating = True
+        self._skip_depth = 0  # Stack depth at which skipping started
+
+    def _emit(self, text):
+        if self.sink is not None:
+            self.sink(text)
+        if self._capture is not None:
+            self._capture.append(text)
+
+    def _flush(self, upto):
+        if upto > self._emitted:
+            self._emit(self._buffer[self._emitted:upto])
+            self._emitted = upto
+
+    def _update_mode(self):
+        """Full tokenizing only inside containers that can hold a wanted subtree."""
+        self._navigating = self._capture is None and (
+            tuple(key for _, key in self._stack[:-1]) in self._prefixes
+        )
+        if not self._navigating:
+            self._skip_depth = len(self._stack)
+
+    def _start_value(self, start):
+        """Starts collecting if the container opened at `start` is a wanted subtree."""
+        path = self.wanted.get(tuple(key for _, key in self._stack))
+        if path is not None:
+            self._flush(start)
+            self._capture = []
+            self._capture_depth = len(self._stack) + 1
+            self._capture_path = path
+
+    def _finish_capture(self, end):
+        self._flush(end)
+        text = "".join(self._capture)
+        self._capture = None
+        self.subtrees[self._capture_path] = json.loads(text, object_hook=_drop_id)
+
+    def feed(self, text, final=False):
+        """
+        Tokenizes the next chunk of text.
+
+        Args:
+            text (str): The chunk.
+            final (bool, optional): True for the last chunk, nothing is held back then.
+        """
+        self._buffer = self._buffer[self._emitted:] + text
+        self._emitted = 0
+        buffer = self._buffer
+        stack = self._stack
+        consumed = 0
+
+        while True:
+            pattern = TOKEN_PATTERN if self._navigating else SKIP_PATTERN
+            match = pattern.search(buffer, consumed)
+            if match is None:
+                break
+            kind = match.lastgroup
+            if kind is None or kind == "partial":
+                # Skipped to the end of the buffer or hit a cut token, completed by the next chunk
+                break
+            consumed = match.end()
+
+            if kind == "punct":
+                char = buffer[consumed - 1]
+                if char == "{" or char == "[":
+                    if self._navigating:
+                        self._start_value(consumed - 1)
+                        stack.append([char, None])
+                        self._expect_key = char == "{"
+                        self._update_mode()
+                    else:
+                        stack.append([char, None])
+                elif char == "}" or char == "]":
+                    stack.pop()
+                    if self._capture is not None and len(stack) < self._capture_depth:
+                        self._finish_capture(consumed)
+                    if self._navigating or len(stack) < self._skip_depth:
+                        self._expect_key = False
+                        self._update_mode()
+                elif char == ":":
+                    self._expect_key = False
+                else:  # ","
+                    self._expect_key = stack[-1][0] == "{"
+            elif kind == "string":
+                if self._expect_key:
+                    stack[-1][1] = match.group("string")
+                    self._expect_key = False
+            elif kind == "wrapper":
+                self._flush(match.start("wrapper"))
+                self._emit(match.group("object_id"))
+                self._emitted = consumed
+
+        if final:
+            self._flush(len(buffer))
+            if self._capture is not None or stack:
+                raise ValueError("Config ended inside an unfinished value")
+        else:
+            # Text after the last token may be a cut number, literal or wrapper
+            self._flush(consumed)
+
+    def result(self) -> dict:
+        """
+        Returns:
+            dict: A config holding only the decoded subtrees, e.g. {"Items": {"Items": [...]}, "Tasks": {...}}.
+        """
+        config = {}
+        for path, subtree in self.subtrees.items():
+            parent = config
+            for key in path[:-1]:
+                parent = parent.setdefault(key, {})
+            parent[path[-1]] = subtree
+        return config
+
+
+def read_config_stream(chunks, sink=None, wanted=WANTED_SUBTREES) -> dict:
+    """
+    Reads the config subtrees from an iterable of text chunks.
+
+    Args:
+        chunks (iterable): str chunks of the config document.
+        sink (callable, optional): Receives the cleaned text, see ConfigStreamReader.
+        wanted (tuple, optional): Key paths of the subtrees to decode.
+
+    Returns:
+        dict: The decoded subtrees.
+    """
+    reader = ConfigStreamReader(wanted, sink)
+    for chunk in chunks:
+        reader.feed(chunk)
+    reader.feed("", final=True)
+    return reader.result()
+
+
+def decode_chunks(byte_chunks, encoding="utf-8"):
+    """Decodes an iterable of bytes chunks, multi-byte characters may span chunks."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def read_config_file(file_path, chunk_size=CHUNK_SIZE, wanted=WANTED_SUBTREES) -> dict:
+    """Streams the config subtrees out of a file, see read_config_stream()."""
+    with open(file_path, "r", encoding="utf-8") as config_file:
+        return read_config_stream(iter(lambda: config_file.read(chunk_size), ""), wanted=wanted)
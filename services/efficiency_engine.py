@@ -0,0 +1,343 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from services.task_service import TaskService
+
+
+class EfficiencyResult:
+    """
+    Per-task results of one engine evaluation, all arrays are indexed by task id
+    (or by position in `rows` when only some tasks were evaluated).
+
+    With 2-D price inputs (scenarios x items) every array gets a leading
+    scenario axis.
+    """
+
+    FIELDS = (
+        "valid",
+        "revenue",
+        "total_cost",
+        "net_profit",
+        "gold_efficiency",
+        "xp_efficiency",
+        "sold_as_base_price",
+    )
+
+    def __init__(self, valid, revenue, total_cost, net_profit, gold_efficiency, xp_efficiency, sold_as_base_price):
+        self.valid = valid
+        self.revenue = revenue
+        self.total_cost = total_cost
+        self.net_profit = net_profit
+        self.gold_efficiency = gold_efficiency
+        self.xp_efficiency = xp_efficiency
+        self.sold_as_base_price = sold_as_base_price
+
+    def copy(self):
+        return EfficiencyResult(**{field: getattr(self, field).copy() for field in self.FIELDS})
+
+    def update_rows(self, rows, partial):
+        """Writes a partial result (evaluated for `rows`) into this full result."""
+        for field in self.FIELDS:
+            getattr(self, field)[rows] = getattr(partial, field)
+
+
+class EfficiencyEngine:
+    """
+    Vectorized gold/xp efficiency for every task at once.
+
+    All tasks are compiled into flat arrays once. The material costs are kept
+    as a sparse task x item matrix in coordinate form, so one evaluation is a
+    gather for the rewards plus a sparse matrix-vector product for the costs.
+    """
+
+    def __init__(self, task_service: TaskService):
+        self.tasks = task_service.tasks
+        # Categories of the same config, for readers that need them consistent with tasks
+        self.categories = task_service.categories
+        self.item_ids = []
+        self.item_index = {}
+
+        num_tasks = len(self.tasks)
+        # Seconds
+        self.base_time = np.zeros(num_tasks)
+        self.exp_reward = np.zeros(num_tasks)
+        self.item_amount = np.zeros(num_tasks)
+        self.reward_base_value = np.zeros(num_tasks)
+        self.reward_index = np.full(num_tasks, -1, dtype=np.intp)
+
+        cost_task, cost_item, cost_amount = [], [], []
+        for task in self.tasks:
+            self.base_time[task.id] = (task.base_time or 0) / 1000.0
+            self.exp_reward[task.id] = task.exp_reward or 0
+            self.item_amount[task.id] = task.item_amount or 0
+            if task.item_reward is not None:
+                self.reward_index[task.id] = self._item_column(task.item_reward.id)
+                self.reward_base_value[task.id] = task.item_reward.base_value
+            for cost in task.costs or []:
+                # Untradeable materials have no Item and no market price
+                if cost.item:
+                    cost_task.append(task.id)
+                    cost_item.append(self._item_column(cost.item.id))
+                    cost_amount.append(cost.amount)
+
+        self.cost_task = np.array(cost_task, dtype=np.intp)
+        self.cost_item = np.array(cost_item, dtype=np.intp)
+        self.cost_amount = np.array(cost_amount, dtype=float)
+        self.has_reward = self.reward_index >= 0
+
+        # Dependency index: item column -> ids of the tasks using it as reward or cost
+        dependents = [set() for _ in self.item_ids]
+        for task in self.tasks:
+            if self.has_reward[task.id]:
+                dependents[self.reward_index[task.id]].add(task.id)
+        for task_id, column in zip(cost_task, cost_item):
+            dependents[column].add(task_id)
+        self.dependents = [np.array(sorted(ids), dtype=np.intp) for ids in dependents]
+
+        # Prices and results of the last committed refresh
+        self.sell = None
+        self.buy = None
+        self.result = None
+        # Tasks to evaluate on the next refresh whatever the prices do (see carry_over)
+        self.pending = np.empty(0, dtype=np.intp)
+
+    def _item_column(self, item_id):
+        column = self.item_index.get(item_id)
+        if column is None:
+            column = self.item_index[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+        return column
+
+    def price_vectors(self, price_book):
+        """
+        Builds the sell and buy price vectors of a price book.
+
+        Args:
+            price_book (PriceBook): The market snapshot.
+
+        Returns:
+            tuple: (sell, buy) float arrays over the engine's items, NaN where no price is known.
+        """
+        sell = np.full(len(self.item_ids), np.nan)
+        buy = np.full(len(self.item_ids), np.nan)
+        for item_id, column in self.item_index.items():
+            sell_price = price_book.sell_price(item_id)
+            buy_price = price_book.buy_price(item_id)
+            if sell_price is not None:
+                sell[column] = sell_price
+            if buy_price is not None:
+                buy[column] = buy_price
+        return sell, buy
+
+    def material_costs(self, buy, rows=None):
+        """Sparse cost matrix times the buy price vector (or matrix of scenarios)."""
+        num_tasks = len(self.tasks)
+        cost_task, cost_item, cost_amount = self.cost_task, self.cost_item, self.cost_amount
+        if rows is not None:
+            entries = np.isin(cost_task, rows)
+            cost_task, cost_item, cost_amount = cost_task[entries], cost_item[entries], cost_amount[entries]
+
+        values = buy[..., cost_item] * cost_amount
+        if values.ndim == 1:
+            totals = np.bincount(cost_task, weights=values, minlength=num_tasks)
+        else:
+            totals = np.zeros(values.shape[:-1] + (num_tasks,))
+            # Scatter-add along the task axis, NaN (missing price) propagates to the task
+            np.add.at(totals.T, cost_task, values.T)
+        return totals if rows is None else totals[..., rows]
+
+    def evaluate(self, sell, buy, time_multiplier=1.0, xp_multiplier=1.0, rows=None):
+        """
+        Evaluates every task against the given prices.
+
+        Args:
+            sell (np.ndarray): Sell prices per engine item, or a (scenarios x items) matrix.
+            buy (np.ndarray): Buy prices per engine item, same shape as sell.
+            time_multiplier (float or np.ndarray, optional): Scales the task time, per task if an array.
+            xp_multiplier (float or np.ndarray, optional): Scales the xp reward, per task if an array.
+            rows (np.ndarray, optional): Only evaluate these task ids. Per-task multipliers
+                must then be given for these rows only.
+
+        Returns:
+            EfficiencyResult: The per-task results.
+        """
+        sell = np.asarray(sell, dtype=float)
+        buy = np.asarray(buy, dtype=float)
+        take = (lambda values: values) if rows is None else (lambda values: values[rows])
+        effective_time = take(self.base_time) * time_multiplier
+        has_reward = take(self.has_reward)
+        reward_base_value = take(self.reward_base_value)
+        item_amount = take(self.item_amount)
+
+        # Tasks without a reward get a NaN price and end up invalid
+        reward_price = np.where(has_reward, sell[..., take(self.reward_index)], np.nan)
+        base_revenue = reward_base_value * item_amount
+        market_revenue = reward_price * item_amount
+        # np.maximum keeps NaN, so a missing sell price invalidates the task
+        revenue = np.maximum(base_revenue, market_revenue)
+        total_cost = self.material_costs(buy, rows)
+        net_profit = revenue - total_cost
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gold_efficiency = net_profit / effective_time
+            xp_efficiency = xp_multiplier * take(self.exp_reward) / effective_time
+
+        valid = (effective_time > 0) & np.isfinite(revenue) & np.isfinite(total_cost)
+        return EfficiencyResult(
+            valid=valid,
+            revenue=revenue,
+            total_cost=total_cost,
+            net_profit=net_profit,
+            gold_efficiency=gold_efficiency,
+            xp_efficiency=xp_efficiency,
+            sold_as_base_price=reward_base_value >= reward_price,
+        )
+
+    def evaluate_price_book(self, price_book, **kwargs):
+        """Evaluates every task against a PriceBook, see evaluate()."""
+        sell, buy = self.price_vectors(price_book)
+        return self.evaluate(sell, buy, **kwargs)
+
+    def changed_tasks(self, sell, buy):
+        """
+        Finds the tasks whose input prices differ from the last committed refresh.
+
+        Args:
+            sell (np.ndarray): New sell price vector.
+            buy (np.ndarray): New buy price vector.
+
+        Returns:
+            np.ndarray: Sorted ids of the affected tasks, every task if nothing was committed yet.
+        """
+        if self.result is None:
+            return np.arange(len(self.tasks), dtype=np.intp)
+
+        def same(new, old):
+            return (new == old) | (np.isnan(new) & np.isnan(old))
+
+        changed_columns = np.flatnonzero(~(same(sell, self.sell) & same(buy, self.buy)))
+        if not len(changed_columns):
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate([self.dependents[column] for column in changed_columns]))
+
+    def carry_over(self, previous, task_map):
+        """
+        Starts from the committed results of the engine of a previous config.
+
+        The results of unchanged tasks are copied over, every other task is
+        evaluated by the next prepare_refresh() even if no price moved.
+
+        Args:
+            previous (EfficiencyEngine): The engine built from the old config.
+            task_map (dict): New task id -> old task id of the tasks whose definition didn't change.
+        """
+        if previous.result is None:
+            return
+        num_tasks = len(self.tasks)
+        new_ids = np.fromiter(task_map.keys(), dtype=np.intp, count=len(task_map))
+        old_ids = np.fromiter(task_map.values(), dtype=np.intp, count=len(task_map))
+
+        self.result = EfficiencyResult(**{
+            field: np.zeros(num_tasks, dtype=getattr(previous.result, field).dtype)
+            for field in EfficiencyResult.FIELDS
+        })
+        self.result.update_rows(new_ids, EfficiencyResult(**{
+            field: getattr(previous.result, field)[old_ids] for field in EfficiencyResult.FIELDS
+        }))
+
+        # Prices follow the item ids, items new to this config have no committed price
+        self.sell = np.full(len(self.item_ids), np.nan)
+        self.buy = np.full(len(self.item_ids), np.nan)
+        for item_id, column in self.item_index.items():
+            old_column = previous.item_index.get(item_id)
+            if old_column is not None:
+                self.sell[column] = previous.sell[old_column]
+                self.buy[column] = previous.buy[old_column]
+
+        self.pending = np.setdiff1d(np.arange(num_tasks, dtype=np.intp), new_ids)
+
+    def prepare_refresh(self, price_book, full=False):
+        """
+        Evaluates only the tasks affected by a new price snapshot.
+
+        Nothing is stored until commit_refresh() is called, so a rejected
+        refresh leaves the previous results untouched.
+
+        Args:
+            price_book (PriceBook): The new market snapshot.
+            full (bool, optional): Re-evaluate every task regardless of the diff.
+
+        Returns:
+            RefreshPlan: The touched rows, their new results and the merged full result.
+        """
+        sell, buy = self.price_vectors(price_book)
+        if full or self.result is None:
+            rows = np.arange(len(self.tasks), dtype=np.intp)
+        else:
+            rows = np.union1d(self.changed_tasks(sell, buy), self.pending)
+
+        partial = self.evaluate(sell, buy, rows=rows)
+        if self.result is None:
+            merged = partial
+        else:
+            merged = self.result.copy()
+            merged.update_rows(rows, partial)
+        return RefreshPlan(sell, buy, rows, partial, merged)
+
+    def commit_refresh(self, plan):
+        """Stores the prices and results of an accepted refresh."""
+        self.sell = plan.sell
+        self.buy = plan.buy
+        self.result = plan.result
+        self.pending = np.empty(0, dtype=np.intp)
+
+
+class RefreshPlan:
+    def __init__(self, sell, buy, rows, partial, result):
+        self.sell = sell
+        self.buy = buy
+        self.rows = rows
+        self.partial = partial
+        self.result = result
+
+    @property
+    def touched(self):
+        return len(self.rows)
+
+    @property
+    def reused(self):
+        return len(self.result.valid) - len(self.rows)
+
+
+class RankedTasks:
+    """
+    Task ids kept ordered by descending gold efficiency.
+
+    Updating one task is a bisect removal and insertion, so a refresh only
+    re-sorts the tasks it touched. Ties keep task id order, the same order a
+    stable sort over the category lists gives.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._key_by_id = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def contains(self, task_id):
+        return task_id in self._key_by_id
+
+    def update(self, task_id, gold_efficiency):
+        """Moves a task to its new rank, or drops it when gold_efficiency is None."""
+        old_key = self._key_by_id.pop(task_id, None)
+        if old_key is not None:
+            del self._keys[bisect_left(self._keys, old_key)]
+        if gold_efficiency is not None:
+            key = (-gold_efficiency, task_id)
+            self._key_by_id[task_id] = key
+            insort(self._keys, key)
+
+    def ids(self):
+        return [task_id for _, task_id in self._keys]
@@ -1,40 +1,38 @@
-import json
+from services.config_loader import DEFAULT_CONFIG_PATH, load_game_config
 
 
 class ItemService:
-    def __init__(self, file_path="data/configData.json"):
+    def __init__(self, file_path=DEFAULT_CONFIG_PATH, config: dict = None):
         self.data: list[Item] = []
-        with open(file_path, "r") as json_file:
-            raw_text = json_file.read()
-            # Clean MongoDB export format (same as TaskService)
-            import re
-            # Remove ObjectId() wrapper
-            raw_text = re.sub(r'ObjectId\("([^"]+)"\)', r'"\1"', raw_text)
-            # Remove _id fields completely
-            raw_text = re.sub(r'^\s*"_id":\s*"[^"]*",?\s*\n', '', raw_text, flags=re.MULTILINE)
-            data = json.loads(raw_text)
-            for item in data["Items"]["Items"]:
-                if (
-                    not item["CanNotBeTraded"]
-                    and not item["Discontinued"]
-                    and not item["CanNotBeSoldToGameShop"]
-                ):
-                    self.data.append(
-                        Item(
-                            item["ItemId"],
-                            item["Name"],
-                            item["BaseValue"],
-                            item["AssociatedSkill"],
-                        )
+        self._by_id: dict[int, Item] = {}
+        data = config if config is not None else load_game_config(file_path)
+        for item in data["Items"]["Items"]:
+            if (
+                not item["CanNotBeTraded"]
+                and not item["Discontinued"]
+                and not item["CanNotBeSoldToGameShop"]
+            ):
+                self.add_item(
+                    Item(
+                        item["ItemId"],
+                        item["Name"],
+                        item["BaseValue"],
+                        item["AssociatedSkill"],
                     )
+                )
+
+    def add_item(self, item):
+        self.data.append(item)
+        # Keep the first occurrence, matching the old linear scan
+        self._by_id.setdefault(item.id, item)
 
     def get_item_by_id(self, id):
-        for item in self.data:
-            if item.id == id:
-                return item
+        return self._by_id.get(id)
 
 
 class Item(object):
+    __slots__ = ("id", "name", "base_value", "associated_skill")
+
     def __init__(
         self,
         id,
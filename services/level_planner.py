@@ -0,0 +1,217 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from utils.xp import default_xp_table
+
+
+OBJECTIVES = ("time", "gold")
+PLAN_CACHE_SIZE = 256
+
+
+class PlanStep(NamedTuple):
+    task_id: int
+    from_level: int
+    to_level: int
+    xp: float
+    actions: int
+    seconds: float
+    gold: float  # None if the task has no market price
+
+
+class LevelPlan(NamedTuple):
+    skill: str
+    objective: str
+    start_xp: float
+    start_level: int
+    target_level: int
+    steps: tuple  # PlanStep per level range, in order
+    total_seconds: float
+    total_gold: float  # None if a step has no market price
+
+    def as_dict(self):
+        return {
+            **self._asdict(),
+            "steps": [step._asdict() for step in self.steps],
+        }
+
+
+class _Segment(NamedTuple):
+    from_level: int
+    to_level: int
+    task_id: int
+    seconds_per_xp: float
+    gold_per_xp: float  # None if unpriced
+
+
+class LevelPlanner:
+    """
+    Fastest or most profitable way to train a skill to a target level.
+
+    The level requirements of a skill's tasks split the way to the target
+    into segments in which the set of unlocked tasks doesn't change. The cost
+    from a breakpoint to the target is the cost of the best task of its
+    segment (least seconds per xp, or most gold per xp with time as
+    tie-break) plus the cost from the next breakpoint. The choice in one
+    segment doesn't limit the others, so this dynamic program resolves in one
+    pass over the breakpoints, O(tasks of the skill) instead of a search over
+    task sequences. The segment choices are cached per (skill,
+    start level, target, objective, price version); the xp amounts of a
+    concrete start xp are filled in per call.
+    """
+
+    def __init__(self, xp_table=None, cache_size=PLAN_CACHE_SIZE):
+        self.xp_table = xp_table or default_xp_table()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _task_rates(self, engine, task_ids, objective, time_multiplier):
+        """task id -> (seconds per xp, gold per xp or None) of the tasks that give xp."""
+        rates = {}
+        result = engine.result
+        for task_id in task_ids:
+            exp_reward = float(engine.exp_reward[task_id])
+            seconds = float(engine.base_time[task_id]) * time_multiplier
+            if exp_reward <= 0 or seconds <= 0:
+                continue
+            gold = None
+            if result is not None and result.valid[task_id]:
+                gold = float(result.net_profit[task_id]) / exp_reward
+            elif not engine.has_reward[task_id] and not engine.tasks[task_id].costs:
+                # Nothing to sell and nothing to buy: training it costs and earns nothing
+                gold = 0.0
+            if objective == "gold" and gold is None:
+                continue
+            rates[task_id] = (seconds / exp_reward, gold)
+        return rates
+
+    def _segments(self, engine, category, start_level, target_level, objective, time_multiplier):
+        tasks = [task for task in category.tasks if task.id is not None]
+        rates = self._task_rates(engine, [task.id for task in tasks], objective, time_multiplier)
+        requirement = {task.id: task.level_requirement or 0 for task in tasks}
+
+        breakpoints = sorted(
+            {start_level, target_level}
+            | {requirement[task_id] for task_id in rates if start_level < requirement[task_id] < target_level}
+        )
+
+        def better(candidate, best):
+            seconds_per_xp, gold_per_xp = rates[candidate]
+            if best is None:
+                return True
+            best_seconds, best_gold = rates[best]
+            if objective == "gold" and gold_per_xp != best_gold:
+                return gold_per_xp > best_gold
+            return seconds_per_xp < best_seconds
+
+        candidates = sorted(rates, key=lambda task_id: requirement[task_id])
+        segments = [None] * (len(breakpoints) - 1)
+        best_task = None
+        unlocked = 0
+        for index in range(len(breakpoints) - 1):
+            level = breakpoints[index]
+            # The unlocked set only grows with the level, so each task is looked at once
+            while unlocked < len(candidates) and requirement[candidates[unlocked]] <= level:
+                if better(candidates[unlocked], best_task):
+                    best_task = candidates[unlocked]
+                unlocked += 1
+            if best_task is None:
+                return ()
+            seconds_per_xp, gold_per_xp = rates[best_task]
+            segments[index] = _Segment(level, breakpoints[index + 1], best_task, seconds_per_xp, gold_per_xp)
+
+        # Merge neighbouring segments trained with the same task
+        merged = []
+        for segment in segments:
+            if merged and merged[-1].task_id == segment.task_id:
+                merged[-1] = merged[-1]._replace(to_level=segment.to_level)
+            else:
+                merged.append(segment)
+        return tuple(merged)
+
+    def plan(self, engine, category, start_xp, target_level, objective="time", price_version=None, time_multiplier=1.0):
+        """
+        Plans the training of one skill.
+
+        Args:
+            engine (EfficiencyEngine): Task data and the results of the last refresh.
+            category (TaskCategory): The skill's tasks.
+            start_xp (float): The player's current xp in the skill.
+            target_level (int): Level to reach.
+            objective (str, optional): 'time' (fewest seconds) or 'gold' (most gold earned).
+            price_version (int, optional): Snapshot version of the engine's results, part of the cache key.
+            time_multiplier (float, optional): Factor on every task time, e.g. from the player's boosts.
+
+        Returns:
+            LevelPlan: The steps, None if some level range has no task to train with.
+                Steps are whole actions, so step xp may overshoot its range a little.
+
+        Raises:
+            ValueError: On an unknown objective or a target outside the XP table.
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+        if not 1 <= target_level <= self.xp_table.max_level:
+            raise ValueError(f"Target level must be between 1 and {self.xp_table.max_level}")
+        start_xp = max(float(start_xp), 0.0)
+        start_level = self.xp_table.xp_to_level(start_xp)
+
+        if start_level >= target_level:
+            segments = ()
+        else:
+            key = (category.name, start_level, target_level, objective, price_version, time_multiplier)
+            with self._lock:
+                segments = self._cache.get(key)
+                if segments is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if segments is None:
+                segments = self._segments(engine, category, start_level, target_level, objective, time_multiplier)
+                with self._lock:
+                    self._cache[key] = segments
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            # Ranges without a usable task are cached as ()
+            if not segments:
+                return None
+
+        steps = []
+        for segment in segments:
+            # Plain floats throughout, the XP table holds ints
+            from_xp = max(start_xp, float(self.xp_table.level_to_xp(segment.from_level)))
+            xp = float(self.xp_table.level_to_xp(segment.to_level)) - from_xp
+            exp_reward = float(engine.exp_reward[segment.task_id])
+            actions = math.ceil(xp / exp_reward)
+            # Whole actions: the last one may overshoot into the next range
+            xp_gained = actions * exp_reward
+            steps.append(PlanStep(
+                task_id=segment.task_id,
+                from_level=segment.from_level,
+                to_level=segment.to_level,
+                xp=xp,
+                actions=actions,
+                seconds=xp_gained * segment.seconds_per_xp,
+                gold=None if segment.gold_per_xp is None else xp_gained * segment.gold_per_xp,
+            ))
+
+        golds = [step.gold for step in steps]
+        return LevelPlan(
+            skill=category.name,
+            objective=objective,
+            start_xp=start_xp,
+            start_level=start_level,
+            target_level=target_level,
+            steps=tuple(steps),
+            total_seconds=sum(step.seconds for step in steps),
+            total_gold=None if None in golds else sum(golds),
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"cached_plans": len(self._cache), "hits": self.hits, "misses": self.misses}
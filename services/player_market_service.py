@@ -1,31 +1,58 @@
 from services import APIClient
+from services.async_api_client import AsyncAPIClient
+from services.rate_limiter import RateLimiterRegistry
 
-import time
-import math
+import asyncio
+
+
+# Requests per second and burst size per endpoint
+PER_ITEM_RATE_LIMIT = (5, 5)
+RANKING_RATE_LIMIT = (1, 2)
 
 
 # This class contains all PlayerMarket API
 # https://query.idleclans.com/api-docs/index.html#tag/PlayerMarket
 class PlayerMarketService:
-    def __init__(self, api_client: APIClient, priceFetchIntervalLimit=10):
+    def __init__(
+        self,
+        api_client: APIClient,
+        priceFetchIntervalLimit=10,
+        async_client: AsyncAPIClient = None,
+        rate_limits: dict = None,
+    ):
+        """
+        Args:
+            api_client (APIClient): The client doing the requests.
+            priceFetchIntervalLimit (int, optional): Seconds between two full price snapshot fetches. Defaults to 10.
+            async_client (AsyncAPIClient, optional): Client for the concurrent batch methods.
+            rate_limits (dict, optional): Overrides of the per-endpoint (rate, capacity) limits.
+        """
         self.api_client = api_client
+        # Concurrent client for the per-item endpoints, shares api_client's session
+        self.async_client = async_client or AsyncAPIClient(api_client)
         self.api_class = "PlayerMarket"
-        self.lastPriceFetch = None
         self.priceFetchIntervalLimit = priceFetchIntervalLimit
-
-    def _fetch_interval_check(self):
-        interval_condition = (
-            self.lastPriceFetch
-            and time.time() - self.lastPriceFetch >= self.priceFetchIntervalLimit
+        # Calls over the limit wait for their turn instead of being dropped
+        self.rate_limiter = RateLimiterRegistry(
+            *PER_ITEM_RATE_LIMIT,
+            limits={
+                "items/prices/latest": (1 / priceFetchIntervalLimit, 1),
+                "items/prices/latest/{id}": PER_ITEM_RATE_LIMIT,
+                "items/prices/latest/comprehensive/{id}": PER_ITEM_RATE_LIMIT,
+                "items/prices/history/{id}": PER_ITEM_RATE_LIMIT,
+                "items/prices/history/value": RANKING_RATE_LIMIT,
+                "items/volume/history": RANKING_RATE_LIMIT,
+                **(rate_limits or {}),
+            },
         )
-        if interval_condition == False:
-            print(
-                f"Price fetched no more than {self.priceFetchIntervalLimit} seconds ago.\n"
-                f"Try again {self.priceFetchIntervalLimit - math.ceil(time.time() - self.lastPriceFetch)}s later."
-            )
-            return False
-        self.lastPriceFetch = time.time()
-        return True
+
+    def _wait_for_budget(self, endpoint_key):
+        """Blocks until the endpoint's rate limit allows another call."""
+        self.rate_limiter.acquire(endpoint_key)
+
+    def rate_limit_metrics(self):
+        """Remaining budget and wait statistics per endpoint."""
+        return self.rate_limiter.metrics()
 
     def get_items_prices_latest(
         self, item_id: int, include_average_price: bool = False
@@ -44,8 +71,8 @@ class PlayerMarketService:
         """
         endpoint = f"{self.api_class}/items/prices/latest/{item_id}"
         params = {"includeAveragePrice": include_average_price}
-        if self._fetch_interval_check():
-            return self.api_client.get(endpoint, params=params)
+        self._wait_for_budget("items/prices/latest/{id}")
+        return self.api_client.get(endpoint, params=params)
 
     def get_items_prices_latest_comprehensive(self, item_id: int):
         """
@@ -67,8 +94,8 @@ class PlayerMarketService:
             dict: A dictionary containing detailed price information for the specified item.
         """
         endpoint = f"{self.api_class}/items/prices/latest/comprehensive/{item_id}"
-        if self._fetch_interval_check():
-            return self.api_client.get(endpoint)
+        self._wait_for_budget("items/prices/latest/comprehensive/{id}")
+        return self.api_client.get(endpoint)
 
     def get_items_prices_latest(self, include_average_price: bool = False):
         """
@@ -84,8 +111,24 @@ class PlayerMarketService:
         """
         endpoint = f"{self.api_class}/items/prices/latest"
         params = {"includeAveragePrice": include_average_price}
-        if self._fetch_interval_check():
-            return self.api_client.get(endpoint, params=params)
+        self._wait_for_budget("items/prices/latest")
+        return self.api_client.get(endpoint, params=params)
+
+    def get_items_prices_latest_if_changed(self, include_average_price: bool = False):
+        """
+        Same as get_items_prices_latest, but tells whether the prices changed since the last call.
+
+        Args:
+            includeAveragePrice (bool, optional): If true, include the average price of each item from the past 24 hours.
+                                                  Defaults to False.
+
+        Returns:
+            ConditionalResponse or None: The prices in .data and .changed, None if the request failed.
+        """
+        endpoint = f"{self.api_class}/items/prices/latest"
+        params = {"includeAveragePrice": include_average_price}
+        self._wait_for_budget("items/prices/latest")
+        return self.api_client.get_if_changed(endpoint, params=params)
 
     def get_items_prices_history(self, item_id: int, period: str = "1d"):
         """
@@ -101,8 +144,8 @@ class PlayerMarketService:
         """
         endpoint = f"{self.api_class}/items/prices/history/{item_id}"
         params = {"period": period}
-        if self._fetch_interval_check():
-            return self.api_client.get(endpoint, params=params)
+        self._wait_for_budget("items/prices/history/{id}")
+        return self.api_client.get(endpoint, params=params)
 
     def get_items_prices_history_value(self, period: str = "1d", limit: int = 10):
         """
@@ -118,8 +161,8 @@ class PlayerMarketService:
         """
         endpoint = f"{self.api_class}/items/prices/history/value"
         params = {"period": period, "limit": limit}
-        if self._fetch_interval_check():
-            return self.api_client.get(endpoint, params=params)
+        self._wait_for_budget("items/prices/history/value")
+        return self.api_client.get(endpoint, params=params)
 
     def get_items_volume_history(self, period: str = "1d", limit: int = 10):
         """
@@ -139,5 +182,69 @@ class PlayerMarketService:
         """
         endpoint = f"{self.api_class}/items/volume/history"
         params = {"period": period, "limit": limit}
-        if self._fetch_interval_check():
-            return self.api_client.get(endpoint, params=params)
+        self._wait_for_budget("items/volume/history")
+        return self.api_client.get(endpoint, params=params)
+
+    async def stream_items_prices_latest_comprehensive(self, item_ids):
+        """
+        Retrieves detailed price information for many items concurrently.
+
+        See get_items_prices_latest_comprehensive for the response format. Requests
+        are bounded by the async client and paced by this endpoint's rate limit.
+
+        Args:
+            item_ids (iterable): The IDs of the items to retrieve price details for.
+
+        Yields:
+            tuple: (item_id, dict or None) as each response arrives.
+        """
+        requests = [
+            (item_id, f"{self.api_class}/items/prices/latest/comprehensive/{item_id}", None)
+            for item_id in item_ids
+        ]
+        rate_limiter = self.rate_limiter.bucket("items/prices/latest/comprehensive/{id}")
+        async for item_id, data in self.async_client.fan_out(requests, rate_limiter):
+            yield item_id, data
+
+    async def stream_items_prices_history(self, item_ids, period: str = "1d"):
+        """
+        Retrieves the price history of many items concurrently.
+
+        See get_items_prices_history for the response format and supported periods.
+
+        Args:
+            item_ids (iterable): The IDs of the items to retrieve the price history for.
+            period (str, optional): The period to retrieve. Defaults to '1d'.
+
+        Yields:
+            tuple: (item_id, dict or None) as each response arrives.
+        """
+        requests = [
+            (item_id, f"{self.api_class}/items/prices/history/{item_id}", {"period": period})
+            for item_id in item_ids
+        ]
+        rate_limiter = self.rate_limiter.bucket("items/prices/history/{id}")
+        async for item_id, data in self.async_client.fan_out(requests, rate_limiter):
+            yield item_id, data
+
+    def get_items_prices_latest_comprehensive_batch(self, item_ids):
+        """
+        Blocking wrapper of stream_items_prices_latest_comprehensive for non-async callers.
+
+        Returns:
+            dict: item_id -> price details, None for items whose request failed.
+        """
+        return asyncio.run(_collect(self.stream_items_prices_latest_comprehensive(item_ids)))
+
+    def get_items_prices_history_batch(self, item_ids, period: str = "1d"):
+        """
+        Blocking wrapper of stream_items_prices_history for non-async callers.
+
+        Returns:
+            dict: item_id -> price history, None for items whose request failed.
+        """
+        return asyncio.run(_collect(self.stream_items_prices_history(item_ids, period)))
+
+
+async def _collect(stream):
+    return {key: value async for key, value in stream}
@@ -0,0 +1,113 @@
+import numpy as np
+
+from utils.xp import default_xp_table
+
+
+# Task categories that are not trained as one skill, their tasks are never level-locked
+UNSKILLED_CATEGORIES = ("ItemCreation", "Combat")
+
+
+def skill_key(category_name):
+    """Task category name -> key of the skill in a profile's skillExperiences ('Woodcutting' -> 'woodcutting')."""
+    if category_name in UNSKILLED_CATEGORIES:
+        return None
+    return category_name[:1].lower() + category_name[1:]
+
+
+class PlayerModifiers:
+    """
+    What a player profile changes about the task results.
+
+    levels come from skillExperiences through the XP table and decide which
+    tasks are unlocked. enchantmentBoosts are read as percent skilling speed
+    per skill, so a boost of 25 makes every task of that skill take 1 / 1.25
+    of its base time. The profile carries no effect sizes for upgrades and
+    equipment, so those are reported but not applied.
+    """
+
+    def __init__(self, username, levels, speed_boosts, upgrades=None, equipment=None):
+        """
+        Args:
+            username (str): The player.
+            levels (dict): skill key -> level.
+            speed_boosts (dict): skill key -> skilling speed boost in percent.
+            upgrades (dict, optional): The profile's upgrades as returned by the API.
+            equipment (dict, optional): The profile's equipment as returned by the API.
+        """
+        self.username = username
+        self.levels = levels
+        self.speed_boosts = speed_boosts
+        self.upgrades = upgrades or {}
+        self.equipment = equipment or {}
+
+    @classmethod
+    def from_profile(cls, profile, xp_table=None):
+        """
+        Args:
+            profile (dict): Response of PlayerService.get_profile().
+            xp_table (XP, optional): XP table to read the levels from.
+
+        Returns:
+            PlayerModifiers: The player's levels and boosts.
+        """
+        xp_table = xp_table or default_xp_table()
+        levels = xp_table.skill_levels(profile.get("skillExperiences") or {})
+        speed_boosts = {
+            skill: float(boost)
+            for skill, boost in (profile.get("enchantmentBoosts") or {}).items()
+            if isinstance(boost, (int, float)) and boost > 0
+        }
+        return cls(
+            username=profile.get("username"),
+            levels=levels,
+            speed_boosts=speed_boosts,
+            upgrades=profile.get("upgrades"),
+            equipment=profile.get("equipment"),
+        )
+
+    def time_multiplier(self, skill):
+        return 1.0 / (1.0 + self.speed_boosts.get(skill, 0.0) / 100.0)
+
+    def as_dict(self):
+        return {
+            "username": self.username,
+            "levels": self.levels,
+            "speed_boosts": self.speed_boosts,
+            "upgrades": self.upgrades,
+            "equipment": self.equipment,
+        }
+
+
+def player_arrays(tasks, task_categories, modifiers, time_multiplier=1.0, xp_multiplier=1.0):
+    """
+    Per-task inputs of EfficiencyEngine.evaluate() for one player.
+
+    Args:
+        tasks (list): TaskItems by task id.
+        task_categories (list): TaskCategory by task id.
+        modifiers (PlayerModifiers): The player's levels and boosts.
+        time_multiplier (float, optional): Extra factor on every task time.
+        xp_multiplier (float, optional): Extra factor on every xp reward.
+
+    Returns:
+        tuple: (time multipliers, xp multipliers, unlocked) arrays indexed by task id.
+    """
+    num_tasks = len(tasks)
+    time_multipliers = np.full(num_tasks, float(time_multiplier))
+    xp_multipliers = np.full(num_tasks, float(xp_multiplier))
+    unlocked = np.ones(num_tasks, dtype=bool)
+
+    # Skills the profile doesn't list are untrained, level 1
+    category_factors = {}
+    for task_id, category in enumerate(task_categories):
+        factors = category_factors.get(category.name)
+        if factors is None:
+            skill = skill_key(category.name)
+            factors = category_factors[category.name] = (
+                (modifiers.time_multiplier(skill), modifiers.levels.get(skill, 1)) if skill else (1.0, None)
+            )
+        skill_time_multiplier, level = factors
+        time_multipliers[task_id] *= skill_time_multiplier
+        if level is not None:
+            unlocked[task_id] = (tasks[task_id].level_requirement or 0) <= level
+    return time_multipliers, xp_multipliers, unlocked
@@ -1,12 +1,38 @@
 from services import APIClient
+from services.ttl_cache import TTLCache
+
+
+# Profiles are fresh for a minute, then served stale for up to 5 more while reloading
+PROFILE_TTL = 60
+PROFILE_STALE_TTL = 300
+MAX_CACHED_PROFILES = 256
 
 
 # This class contains all Player API
 # https://query.idleclans.com/api-docs/index.html#tag/Player
 class PlayerService:
-    def __init__(self, api_client: APIClient):
+    def __init__(
+        self,
+        api_client: APIClient,
+        profile_ttl=PROFILE_TTL,
+        profile_stale_ttl=PROFILE_STALE_TTL,
+        max_cached_profiles=MAX_CACHED_PROFILES,
+    ):
+        """
+        Args:
+            api_client (APIClient): The client doing the requests.
+            profile_ttl (float, optional): Seconds a cached profile is fresh.
+            profile_stale_ttl (float, optional): Seconds after that a profile is served while it reloads.
+            max_cached_profiles (int, optional): Profiles kept, least recently used ones are evicted.
+        """
         self.api_client = api_client
         self.api_class = "Player"
+        # Concurrent lookups of one player share a single upstream call
+        self.profile_cache = TTLCache(profile_ttl, profile_stale_ttl, max_cached_profiles)
+
+    def cache_stats(self):
+        """Hit, miss and coalesce counters of the profile cache."""
+        return self.profile_cache.stats()
 
     def get_clan_logs(self, name: str, skip: int = 0, limit: int = 100):
         """
@@ -30,7 +56,7 @@ class PlayerService:
 
     def get_profile(self, name: str):
         """
-        Retrieves the profile for a specific player.
+        Retrieves the profile for a specific player, cached (see PlayerService.__init__).
 
         Args:
             name (str): The name of the player to retrieve the profile for.
@@ -55,11 +81,11 @@ class PlayerService:
                 - 'guardiansOfTheCitadelCompletions': integer
         """
         endpoint = f"{self.api_class}/profile/{name}"
-        return self.api_client.get(endpoint)
+        return self.profile_cache.get(("profile", name), lambda: self.api_client.get(endpoint))
 
     def get_profile_simple(self, name):
         """
-        Retrieves a simple profile for a specific player.
+        Retrieves a simple profile for a specific player, cached like get_profile().
 
         Args:
             username (str): The username of the player to retrieve the simple profile for.
@@ -73,4 +99,4 @@ class PlayerService:
                 - 'taskNameOnLogout': string or null
         """
         endpoint = f"{self.api_class}/profile/simple/{name}"
-        return self.api_client.get(endpoint)
+        return self.profile_cache.get(("profile/simple", name), lambda: self.api_client.get(endpoint))
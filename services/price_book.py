@@ -0,0 +1,123 @@
+import itertools
+
+
+# Strategies resolved from the local price history instead of the snapshot itself
+HISTORY_STRATEGIES = ("average_7d", "average_30d", "vwap_7d", "median_7d")
+PRICE_STRATEGIES = ("instant", "average_1d") + HISTORY_STRATEGIES
+PRICE_TYPES = ("sell", "buy")
+
+# Every PriceBook gets a new version, caches derived from prices key on it
+_versions = itertools.count(1)
+
+
+def resolve_price(item_price_data, strategy, price_type="sell", item_history=None):
+    """
+    Resolve the price of a market entry for a given strategy.
+
+    Args:
+        item_price_data (dict): Price data from API for a specific item.
+        strategy (str): One of PRICE_STRATEGIES.
+        price_type (str, optional): 'sell' for revenue, 'buy' for costs. Defaults to 'sell'.
+        item_history (dict, optional): Rolling aggregates of the item by strategy,
+            see RollingAggregates.history().
+
+    Returns:
+        float or None: The price to use for calculations, None if data is missing.
+    """
+    if not item_price_data:
+        return None
+
+    if price_type == "sell":
+        # Instant sell: what buyers are offering right now
+        instant_price = item_price_data.get("highestBuyPrice")
+    else:
+        # Instant buy: what sellers are asking right now
+        instant_price = item_price_data.get("lowestSellPrice")
+
+    if strategy == "instant":
+        return instant_price
+
+    if strategy == "average_1d":
+        # Use 24h average price (more stable, realistic)
+        avg_price = item_price_data.get("dailyAveragePrice")
+        # If average is 0, item wasn't traded in 24h - fallback to instant
+        if avg_price and avg_price > 0:
+            return avg_price
+        return instant_price
+
+    if strategy in HISTORY_STRATEGIES:
+        # Same fallback as average_1d: no trades in the window means instant price
+        avg_price = (item_history or {}).get(strategy)
+        if avg_price and avg_price > 0:
+            return avg_price
+        return instant_price
+
+    return None
+
+
+class PriceBook:
+    """
+    Indexed view of one market price snapshot.
+
+    Built once per price fetch. Entries are keyed by itemId and the resolved
+    buy/sell price of every known strategy is computed up front, so the
+    efficiency calculation never has to walk the raw snapshot.
+    """
+
+    def __init__(self, latest_prices, strategy, history=None):
+        """
+        Args:
+            latest_prices (list): Raw response of the latest prices endpoint.
+            strategy (dict): Price strategy per price type, e.g. {'sell': 'average_1d', 'buy': 'instant'}.
+            history (dict, optional): item_id -> rolling aggregates by strategy, from RollingAggregates.
+                Without it the history strategies fall back to the instant price.
+        """
+        self.version = next(_versions)
+        self.strategy = dict(strategy)
+        self.entries = {entry["itemId"]: entry for entry in latest_prices or []}
+        history = history or {}
+        # resolved[strategy][price_type][item_id] -> price or None
+        self.resolved = {
+            name: {
+                price_type: {
+                    item_id: resolve_price(entry, name, price_type, history.get(item_id))
+                    for item_id, entry in self.entries.items()
+                }
+                for price_type in PRICE_TYPES
+            }
+            for name in PRICE_STRATEGIES
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item_id):
+        return item_id in self.entries
+
+    def get(self, item_id):
+        """Returns the raw market entry for an item, or None if it isn't listed."""
+        return self.entries.get(item_id)
+
+    def price(self, item_id, price_type="sell", strategy=None):
+        """
+        Returns the resolved price of an item.
+
+        Args:
+            item_id (int): The item to look up.
+            price_type (str, optional): 'sell' or 'buy'. Defaults to 'sell'.
+            strategy (str, optional): Overrides the configured strategy for this price type.
+
+        Returns:
+            float or None: The resolved price, None if the item or its price is missing.
+        """
+        strategy = strategy or self.strategy.get(price_type, "average_1d")
+        prices = self.resolved.get(strategy)
+        if prices is None:
+            return None
+        return prices[price_type].get(item_id)
+
+    def sell_price(self, item_id):
+        return self.price(item_id, "sell")
+
+    def buy_price(self, item_id):
+        return self.price(item_id, "buy")
@@ -0,0 +1,198 @@
+import itertools
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_PRICE_HISTORY_PATH = "cache/price_history.sqlite3"
+
+# One raw sample per item and 15 minutes, older samples only live on in the rollups
+SAMPLE_INTERVAL = 15 * 60
+HOUR = 3600
+DAY = 86400
+RAW_RETENTION = 2 * DAY
+HOURLY_RETENTION = 14 * DAY
+DAILY_RETENTION = 400 * DAY
+PRUNE_INTERVAL = HOUR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts INTEGER PRIMARY KEY,
+    items INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    ts INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    sell REAL,
+    buy REAL,
+    avg REAL,
+    PRIMARY KEY (ts, item_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hourly (
+    bucket INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    n_sell INTEGER NOT NULL, sell_sum REAL NOT NULL,
+    n_buy INTEGER NOT NULL, buy_sum REAL NOT NULL,
+    n_avg INTEGER NOT NULL, avg_sum REAL NOT NULL,
+    PRIMARY KEY (bucket, item_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily (
+    bucket INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    n_sell INTEGER NOT NULL, sell_sum REAL NOT NULL,
+    n_buy INTEGER NOT NULL, buy_sum REAL NOT NULL,
+    n_avg INTEGER NOT NULL, avg_sum REAL NOT NULL,
+    PRIMARY KEY (bucket, item_id)
+) WITHOUT ROWID;
+"""
+
+ROLLUP_UPSERT = """
+INSERT INTO {table} (bucket, item_id, n_sell, sell_sum, n_buy, buy_sum, n_avg, avg_sum)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (bucket, item_id) DO UPDATE SET
+    n_sell = n_sell + excluded.n_sell, sell_sum = sell_sum + excluded.sell_sum,
+    n_buy = n_buy + excluded.n_buy, buy_sum = buy_sum + excluded.buy_sum,
+    n_avg = n_avg + excluded.n_avg, avg_sum = avg_sum + excluded.avg_sum
+"""
+
+
+def _positive(value):
+    """Market prices of 0 mean 'no offer' or 'not traded', they don't belong in an average."""
+    return value if value and value > 0 else None
+
+
+class PriceHistoryStore:
+    """
+    Append-only local history of the full market price snapshots.
+
+    Every fetchPrices() snapshot is stored once per 15 minute bucket and at the
+    same time added to hourly and daily rollups (counts and sums per item), so
+    raw samples can be pruned after two days while RollingAggregates still
+    warms its 7d/30d windows from at most 30 daily rows per item.
+    """
+
+    def __init__(self, path=DEFAULT_PRICE_HISTORY_PATH):
+        """
+        Args:
+            path (str, optional): SQLite database file, created if missing.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Written by the refresh job, read by /status, so one connection behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, latest_prices, timestamp=None):
+        """
+        Appends a price snapshot to the history.
+
+        Args:
+            latest_prices (list): Raw response of the latest prices endpoint.
+            timestamp (float, optional): Fetch time, defaults to now.
+
+        Returns:
+            bool: True if stored, False if this 15 minute bucket already has a snapshot.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        ts = int(timestamp) - int(timestamp) % SAMPLE_INTERVAL
+
+        samples = []
+        for entry in latest_prices or []:
+            samples.append((
+                ts,
+                entry["itemId"],
+                _positive(entry.get("highestBuyPrice")),
+                _positive(entry.get("lowestSellPrice")),
+                _positive(entry.get("dailyAveragePrice")),
+            ))
+
+        def rollup_rows(bucket):
+            return [
+                (
+                    bucket, item_id,
+                    sell is not None, sell or 0.0,
+                    buy is not None, buy or 0.0,
+                    avg is not None, avg or 0.0,
+                )
+                for _, item_id, sell, buy, avg in samples
+            ]
+
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO snapshots (ts, items) VALUES (?, ?)", (ts, len(samples))
+            ).rowcount
+            if not inserted:
+                return False
+            self._conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?)", samples)
+            self._conn.executemany(ROLLUP_UPSERT.format(table="hourly"), rollup_rows(ts - ts % HOUR))
+            self._conn.executemany(ROLLUP_UPSERT.format(table="daily"), rollup_rows(ts - ts % DAY))
+
+        if timestamp - self._last_prune >= PRUNE_INTERVAL:
+            self.prune(timestamp)
+        return True
+
+    def prune(self, now=None):
+        """Drops raw samples and rollups that fell out of their retention window."""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM samples WHERE ts < ?", (now - RAW_RETENTION,))
+            self._conn.execute("DELETE FROM snapshots WHERE ts < ?", (now - RAW_RETENTION,))
+            self._conn.execute("DELETE FROM hourly WHERE bucket < ?", (now - HOURLY_RETENTION,))
+            self._conn.execute("DELETE FROM daily WHERE bucket < ?", (now - DAILY_RETENTION,))
+        self._last_prune = now
+
+    def rollup_buckets(self, table, since):
+        """
+        Yields the buckets of a rollup table from `since` on, oldest first.
+
+        Args:
+            table (str): 'hourly' or 'daily'.
+            since (int): First bucket start to include.
+
+        Yields:
+            tuple: (bucket, item_ids, average price sums, average price counts) of traded items.
+        """
+        if table not in ("hourly", "daily"):
+            raise ValueError(f"Unknown rollup table: {table}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT bucket, item_id, avg_sum, n_avg FROM {table} "
+                "WHERE bucket >= ? AND n_avg > 0 ORDER BY bucket",
+                (since,),
+            ).fetchall()
+        for bucket, group in itertools.groupby(rows, key=lambda row: row[0]):
+            _, item_ids, price_sums, counts = zip(*group)
+            yield bucket, list(item_ids), list(price_sums), list(counts)
+
+    def last_sample(self):
+        """Start of the newest stored 15 minute bucket, None if the store is empty."""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(ts) FROM snapshots").fetchone()[0]
+
+    def stats(self):
+        """Row counts and covered time range, for /status."""
+        with self._lock:
+            first, last, snapshots = self._conn.execute(
+                "SELECT MIN(ts), MAX(ts), COUNT(*) FROM snapshots"
+            ).fetchone()
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("samples", "hourly", "daily")
+            }
+        return {
+            "snapshots": snapshots,
+            "first_sample": first,
+            "last_sample": last,
+            **counts,
+        }
@@ -0,0 +1,329 @@
+import math
+from typing import NamedTuple
+
+from services.task_service import TaskService
+
+
+class MaterialPlan(NamedTuple):
+    item_id: int
+    amount: float
+    source: str  # "buy" or "make"
+    unit_cost: float  # Gold per unit, market price or cost of the chosen recipe
+    unit_labor: float  # Seconds of work per unit, 0 when bought
+    producer_id: int  # Task making the item, None when bought
+
+
+class ChainPlan(NamedTuple):
+    """Most gold per hour of labor for one task when every material may be bought or made."""
+
+    task_id: int
+    revenue: float
+    total_cost: float
+    net_profit: float
+    labor_seconds: float  # The task's own time plus the time to make the made materials
+    gold_per_hour: float
+    materials: tuple  # MaterialPlan per cost of the task
+
+    def as_dict(self):
+        return {
+            **self._asdict(),
+            "materials": [material._asdict() for material in self.materials],
+        }
+
+
+def _strongly_connected(nodes, edges):
+    """
+    Tarjan's algorithm, iterative.
+
+    Returns:
+        list: The strongly connected components, each one after every component it has edges to.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+# Rounds of re-pricing labor at the chain's gold per second, converges in a handful
+MAX_RATE_ITERATIONS = 20
+
+
+class ProductionGraph:
+    """
+    Make-vs-buy solver over the recipe graph of all tasks.
+
+    Items are nodes, every task producing an item links it to the items the
+    task consumes. The topological order (materials before products) is
+    computed once per config; items on a recipe cycle are always bought.
+    A price update walks that order once, pricing every item at the cheaper
+    of its market buy price and its cheapest recipe, and only revisits the
+    items downstream of a changed price.
+
+    Making a material costs labor, so the cheapest chain isn't the one that
+    earns most per hour. Each task plan starts from the cheapest chain and
+    then values labor at that chain's gold per second: an item is made only
+    if its recipe saves more than the labor it takes is worth at that rate.
+    Re-solving with the new plan's rate until it stops improving
+    (Dinkelbach's method) maximizes the chain's gold per hour; the plan
+    buying every material is kept if it is still better.
+    """
+
+    def __init__(self, task_service: TaskService):
+        self.tasks = task_service.tasks
+        # item id -> ids of the tasks producing it
+        self.producers = {}
+        # task id -> ((item id, amount), ...) of its tradeable materials, like EfficiencyEngine
+        self.inputs = {}
+        for task in self.tasks:
+            self.inputs[task.id] = tuple((cost.item.id, cost.amount) for cost in task.costs or [] if cost.item)
+            if task.item_reward is not None and (task.base_time or 0) > 0 and (task.item_amount or 0) > 0:
+                self.producers.setdefault(task.item_reward.id, []).append(task.id)
+
+        # product -> materials of its recipes, and the reverse for propagating price changes
+        materials = {}
+        self.consumers = {}
+        for item_id, task_ids in self.producers.items():
+            for task_id in task_ids:
+                for material_id, _amount in self.inputs[task_id]:
+                    materials.setdefault(item_id, set()).add(material_id)
+                    self.consumers.setdefault(material_id, set()).add(item_id)
+
+        nodes = set(self.producers)
+        for task in self.tasks:
+            nodes.update(material_id for material_id, _amount in self.inputs[task.id])
+            if task.item_reward is not None:
+                nodes.add(task.item_reward.id)
+        self.order = []
+        self.cyclic = set()
+        for component in _strongly_connected(sorted(nodes), materials):
+            if len(component) > 1 or component[0] in materials.get(component[0], ()):
+                self.cyclic.update(component)
+            self.order.extend(sorted(component))
+        self.position = {item_id: position for position, item_id in enumerate(self.order)}
+
+        # task ids using an item as material, and the tasks selling it
+        self.used_by = {}
+        for task_id, task_inputs in self.inputs.items():
+            for material_id, _amount in task_inputs:
+                self.used_by.setdefault(material_id, set()).add(task_id)
+        self.sold_by = {}
+        for task in self.tasks:
+            if task.item_reward is not None:
+                self.sold_by.setdefault(task.item_reward.id, set()).add(task.id)
+
+        # Memoized between updates: prices, item id -> cheapest (unit cost, unit labor, producer id), task plans
+        self.buy = {}
+        self.sell = {}
+        self.unit = {}
+        self.plans = {}
+        self.last_update = {"items": 0, "tasks": 0}
+
+    def _recipe(self, task_id, unit):
+        """(cost, labor) of one run of a task's materials, NaN cost if one can't be priced."""
+        cost = 0.0
+        labor = 0.0
+        for material_id, amount in self.inputs[task_id]:
+            unit_cost, unit_labor, _producer = unit(material_id)
+            cost += amount * unit_cost
+            labor += amount * unit_labor
+        return cost, labor
+
+    def _price_item(self, item_id, unit, labor_value=0.0):
+        """
+        Buys or makes one unit of an item, whichever costs less counting labor at `labor_value`.
+
+        Args:
+            item_id (int): The item.
+            unit (callable): item id -> (unit cost, unit labor, producer id) of the materials.
+            labor_value (float, optional): Gold one second of labor is worth.
+
+        Returns:
+            tuple: (unit cost, unit labor, producer id or None when bought).
+        """
+        buy_price = self.buy.get(item_id)
+        best = (math.nan if buy_price is None else buy_price, 0.0, None)
+        best_value = best[0]
+        if item_id in self.cyclic:
+            return best
+        for task_id in self.producers.get(item_id, ()):
+            task = self.tasks[task_id]
+            cost, labor = self._recipe(task_id, unit)
+            cost /= task.item_amount
+            labor = (labor + task.base_time / 1000.0) / task.item_amount
+            value = cost + labor_value * labor
+            # NaN never compares smaller, so an unpriceable recipe never wins
+            if value < best_value or (math.isnan(best_value) and not math.isnan(value)):
+                best = (cost, labor, task_id)
+                best_value = value
+        return best
+
+    def _labor_priced_unit(self, labor_value):
+        """_price_item() of every item reachable from a task, memoized for one labor value."""
+        memo = {}
+
+        def unit(item_id):
+            priced = memo.get(item_id)
+            if priced is None:
+                priced = memo[item_id] = self._price_item(item_id, unit, labor_value)
+            return priced
+
+        return unit
+
+    def _bought_unit(self, item_id):
+        buy_price = self.buy.get(item_id)
+        return (math.nan if buy_price is None else buy_price, 0.0, None)
+
+    def _plan_task(self, task):
+        if task.item_reward is None or (task.base_time or 0) <= 0:
+            return None
+        sell_price = self.sell.get(task.item_reward.id)
+        if sell_price is None:
+            return None
+        revenue = max(task.item_reward.base_value * task.item_amount, sell_price * task.item_amount)
+
+        # Cheapest chain first, then re-price labor at the best rate found so far
+        plan = self._chain_plan(task, revenue, self.unit.__getitem__)
+        for _ in range(MAX_RATE_ITERATIONS):
+            if plan is None or plan.net_profit <= 0:
+                break
+            candidate = self._chain_plan(
+                task, revenue, self._labor_priced_unit(plan.net_profit / plan.labor_seconds)
+            )
+            if candidate is None or candidate.gold_per_hour <= plan.gold_per_hour * (1 + 1e-9):
+                break
+            plan = candidate
+
+        bought = self._chain_plan(task, revenue, self._bought_unit)
+        if plan is None or (bought is not None and bought.gold_per_hour > plan.gold_per_hour):
+            return bought
+        return plan
+
+    def _chain_plan(self, task, revenue, unit):
+        materials = []
+        for material_id, amount in self.inputs[task.id]:
+            unit_cost, unit_labor, producer_id = unit(material_id)
+            materials.append(MaterialPlan(
+                item_id=material_id,
+                amount=amount,
+                source="buy" if producer_id is None else "make",
+                unit_cost=unit_cost,
+                unit_labor=unit_labor,
+                producer_id=producer_id,
+            ))
+        total_cost = sum(material.amount * material.unit_cost for material in materials)
+        if math.isnan(total_cost):
+            return None
+        labor_seconds = task.base_time / 1000.0 + sum(material.amount * material.unit_labor for material in materials)
+        net_profit = revenue - total_cost
+        return ChainPlan(
+            task_id=task.id,
+            revenue=revenue,
+            total_cost=total_cost,
+            net_profit=net_profit,
+            labor_seconds=labor_seconds,
+            gold_per_hour=net_profit / labor_seconds * 3600,
+            materials=tuple(materials),
+        )
+
+    def update(self, price_book):
+        """
+        Re-solves the graph for a new price snapshot.
+
+        Only the items whose buy price changed and the items made from them
+        are re-priced, and only the tasks using or selling those items are
+        re-planned. The plans are swapped in as a new dict, readers holding
+        the old one are not affected.
+
+        Args:
+            price_book (PriceBook): The market snapshot.
+
+        Returns:
+            dict: task id -> ChainPlan of every task that can be priced.
+        """
+        buy = {}
+        sell = {}
+        for item_id in self.order:
+            buy_price = price_book.buy_price(item_id)
+            sell_price = price_book.sell_price(item_id)
+            if buy_price is not None:
+                buy[item_id] = buy_price
+            if sell_price is not None:
+                sell[item_id] = sell_price
+
+        if not self.unit:
+            dirty_items = set(self.order)
+            dirty_tasks = set(range(len(self.tasks)))
+        else:
+            changed = {item_id for item_id in self.order if buy.get(item_id) != self.buy.get(item_id)}
+            dirty_items = set()
+            pending = list(changed)
+            while pending:
+                item_id = pending.pop()
+                if item_id not in dirty_items:
+                    dirty_items.add(item_id)
+                    pending.extend(self.consumers.get(item_id, ()))
+            dirty_tasks = set()
+            for item_id in dirty_items:
+                dirty_tasks.update(self.used_by.get(item_id, ()))
+            for item_id in self.order:
+                if sell.get(item_id) != self.sell.get(item_id):
+                    dirty_tasks.update(self.sold_by.get(item_id, ()))
+
+        self.buy = buy
+        self.sell = sell
+        for item_id in sorted(dirty_items, key=self.position.__getitem__):
+            self.unit[item_id] = self._price_item(item_id, self.unit.__getitem__)
+
+        plans = dict(self.plans)
+        for task_id in dirty_tasks:
+            plan = self._plan_task(self.tasks[task_id])
+            if plan is None:
+                plans.pop(task_id, None)
+            else:
+                plans[task_id] = plan
+        self.plans = plans
+        self.last_update = {"items": len(dirty_items), "tasks": len(dirty_tasks)}
+        return plans
+
+    def stats(self):
+        return {
+            "items": len(self.order),
+            "produced_items": len(self.producers),
+            "cyclic_items": sorted(self.cyclic),
+            "planned_tasks": len(self.plans),
+            "last_update": self.last_update,
+        }
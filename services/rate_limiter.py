@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Callers reserve a token and wait until it is theirs instead of being
+    turned away, so bursts are smoothed to `rate` requests per second after
+    the first `capacity` requests.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float, optional): Maximum burst size. Defaults to rate (one second worth).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        # Metrics
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes tokens from the bucket, going into debt if needed.
+
+        Returns:
+            float: Seconds the caller has to wait before using the reserved tokens.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self, tokens: float = 1):
+        """Blocks until the tokens are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """Waits without blocking the event loop until the tokens are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def metrics(self):
+        """Current budget and wait statistics of the bucket."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                # Negative while callers are queued on reserved tokens
+                "tokens_available": round(self._tokens, 2),
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "avg_wait_s": round(self.total_wait / self.delayed, 3) if self.delayed else 0.0,
+                "max_wait_s": round(self.max_wait, 3),
+            }
+
+
+class RateLimiterRegistry:
+    """
+    One TokenBucket per endpoint, created on first use.
+
+    Endpoints without an explicit limit share the default rate but still get
+    their own bucket.
+    """
+
+    def __init__(self, default_rate: float, default_capacity: float = None, limits: dict = None):
+        """
+        Args:
+            default_rate (float): Tokens per second for endpoints without their own limit.
+            default_capacity (float, optional): Burst size for those endpoints.
+            limits (dict, optional): endpoint key -> (rate, capacity).
+        """
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+        self.limits = dict(limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, capacity = self.limits.get(key, (self.default_rate, self.default_capacity))
+                bucket = self._buckets[key] = TokenBucket(rate, capacity)
+            return bucket
+
+    def acquire(self, key, tokens: float = 1):
+        self.bucket(key).acquire(tokens)
+
+    async def acquire_async(self, key, tokens: float = 1):
+        await self.bucket(key).acquire_async(tokens)
+
+    def metrics(self):
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {key: bucket.metrics() for key, bucket in buckets.items()}
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import pickle
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+
+DEFAULT_SNAPSHOT_CACHE_PATH = "cache/result_snapshot.pickle"
+# Bump when TaskRow/ResultSnapshot change shape so old files are ignored
+SNAPSHOT_CACHE_FORMAT_VERSION = 2
+
+
+class TaskRow(NamedTuple):
+    """Compact, immutable result of one task for one refresh"""
+
+    id: int
+    name: str
+    category_name: str
+    revenue: float
+    total_cost: float
+    net_profit: float
+    base_time: float
+    gold_efficiency: float
+    xp_efficiency: float
+    sold_as_base_price: bool
+
+    @classmethod
+    def from_result(cls, task, category_name, result):
+        """Builds the row of a task from an EfficiencyResult indexed by task id."""
+        return cls(
+            id=task.id,
+            name=task.name,
+            category_name=category_name,
+            revenue=float(result.revenue[task.id]),
+            total_cost=float(result.total_cost[task.id]),
+            net_profit=float(result.net_profit[task.id]),
+            base_time=task.base_time,
+            gold_efficiency=float(result.gold_efficiency[task.id]),
+            xp_efficiency=float(result.xp_efficiency[task.id]),
+            sold_as_base_price=bool(result.sold_as_base_price[task.id]),
+        )
+
+
+class CategoryRows(NamedTuple):
+    name: str
+    raw_name: str
+    tasks_with_data: tuple
+
+
+class ResultSnapshot:
+    """
+    One refresh worth of results, never changed after it is built.
+
+    The background job builds a new snapshot and publishes it with a single
+    reference assignment, so readers only need to read that reference once
+    and can use the snapshot without holding a lock.
+    """
+
+    __slots__ = (
+        "version",
+        "price_book",
+        "tasks",
+        "categories",
+        "all_tasks",
+        "task_ids",
+        "total_categories",
+        "total_tasks",
+        "profitable_tasks",
+        "top_tasks",
+        "timestamp",
+        "created_at",
+    )
+
+    def __init__(self, version, price_book, tasks, categories, all_tasks):
+        """
+        Args:
+            version (int): Increases by one with every published snapshot.
+            price_book (PriceBook): The prices the results were calculated with.
+            tasks (list): The TaskItems by task id the results belong to, a config
+                reload swaps them together with the results.
+            categories (tuple): CategoryRows with their tasks by descending gold efficiency.
+            all_tasks (tuple): Every TaskRow by descending gold efficiency.
+        """
+        self.version = version
+        self.price_book = price_book
+        self.tasks = tuple(tasks)
+        self.categories = tuple(categories)
+        self.all_tasks = tuple(all_tasks)
+        self.task_ids = frozenset(row.id for row in self.all_tasks)
+        self.total_categories = len(self.categories)
+        self.total_tasks = sum(len(category.tasks_with_data) for category in self.categories)
+        self.profitable_tasks = sum(1 for row in self.all_tasks if row.gold_efficiency > 0)
+        self.top_tasks = self.all_tasks[:10]
+        self.created_at = time.time()
+        self.timestamp = datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d %H:%M:%S")
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"ResultSnapshot is immutable, cannot set {name}")
+        super().__setattr__(name, value)
+
+    def has_task(self, task_id):
+        return task_id in self.task_ids
+
+    def as_template_context(self):
+        """The variables index.html expects."""
+        return {
+            "categories": self.categories,
+            "all_tasks": self.all_tasks,
+            "total_categories": self.total_categories,
+            "total_tasks": self.total_tasks,
+            "profitable_tasks": self.profitable_tasks,
+            "top_tasks": self.top_tasks,
+            "timestamp": self.timestamp,
+            "version": self.version,
+        }
+
+
+def task_fingerprint(tasks) -> str:
+    """Hash of the task ids and names, a persisted snapshot is only valid for the same task list."""
+    digest = hashlib.sha1()
+    for task in tasks:
+        digest.update(f"{task.id}:{task.name}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_snapshot(snapshot, fingerprint, path=DEFAULT_SNAPSHOT_CACHE_PATH):
+    """
+    Persists a snapshot so the next process start can serve it right away.
+
+    Args:
+        snapshot (ResultSnapshot): The snapshot to store.
+        fingerprint (str): task_fingerprint() of the tasks the snapshot was built from.
+        path (str, optional): Target file, written atomically.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {
+        "format": SNAPSHOT_CACHE_FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "snapshot": snapshot,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as snapshot_file:
+        pickle.dump(payload, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(fingerprint, path=DEFAULT_SNAPSHOT_CACHE_PATH):
+    """
+    Loads the snapshot persisted by a previous run.
+
+    Args:
+        fingerprint (str): task_fingerprint() of the current tasks.
+        path (str, optional): The snapshot file.
+
+    Returns:
+        ResultSnapshot or None: The snapshot, None if missing, unreadable or built for other tasks.
+    """
+    try:
+        with open(path, "rb") as snapshot_file:
+            payload = pickle.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot cache {path}: {e}")
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("format") != SNAPSHOT_CACHE_FORMAT_VERSION
+        or payload.get("fingerprint") != fingerprint
+    ):
+        return None
+    return payload.get("snapshot")
@@ -0,0 +1,294 @@
+import time
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from services.price_history import DAY, HOUR, SAMPLE_INTERVAL
+
+
+# Strategy -> (ring, buckets in the window)
+# (average_1d comes with every snapshot as dailyAveragePrice, no need to aggregate it)
+MEAN_WINDOWS = {
+    "average_7d": ("hourly", 168),
+    "average_30d": ("daily", 30),
+}
+VWAP_WINDOW = ("hourly", 168)
+MEDIAN_WINDOW = 168
+AGGREGATE_STRATEGIES = tuple(MEAN_WINDOWS) + ("vwap_7d", "median_7d")
+
+# First field found is used as the trade volume of a sample, without one every sample weighs 1
+VOLUME_FIELDS = ("dailyTradeVolume", "tradeVolume", "volume")
+
+
+def sample_price(entry):
+    """The traded price a sample contributes: the 24h average, None if the item wasn't traded."""
+    price = entry.get("dailyAveragePrice")
+    return price if price and price > 0 else None
+
+
+def sample_volume(entry):
+    for field in VOLUME_FIELDS:
+        volume = entry.get(field)
+        if volume is not None:
+            return volume
+    return 1.0
+
+
+class BucketRing:
+    """
+    Ring of time buckets over every item, with running totals per window.
+
+    Each bucket holds per-item sums (price, count, price * volume, volume).
+    Moving to a new bucket subtracts the buckets that fall out of each window
+    from its totals, so adding a sample and reading a window are O(1) per item.
+    """
+
+    def __init__(self, bucket_seconds, windows, num_items):
+        """
+        Args:
+            bucket_seconds (int): Width of one bucket.
+            windows (iterable): Window lengths in buckets, the largest sets the ring size.
+            num_items (int): Initial number of item columns.
+        """
+        self.bucket_seconds = bucket_seconds
+        self.windows = sorted(set(windows))
+        self.size = self.windows[-1]
+        self.current = None
+        # [bucket slot, field, item], fields: price sum, count, price * volume, volume
+        self.slots = np.zeros((self.size, 4, num_items))
+        self.totals = {window: np.zeros((4, num_items)) for window in self.windows}
+
+    def grow(self, num_items):
+        extra = num_items - self.slots.shape[2]
+        if extra > 0:
+            self.slots = np.pad(self.slots, ((0, 0), (0, 0), (0, extra)))
+            self.totals = {
+                window: np.pad(totals, ((0, 0), (0, extra))) for window, totals in self.totals.items()
+            }
+
+    def advance(self, bucket):
+        """Makes `bucket` the current bucket, evicting what leaves each window."""
+        if self.current is None or bucket - self.current >= self.size:
+            self.slots[:] = 0
+            for totals in self.totals.values():
+                totals[:] = 0
+            self.current = bucket
+            return
+        while self.current < bucket:
+            self.current += 1
+            for window in self.windows:
+                self.totals[window] -= self.slots[(self.current - window) % self.size]
+            self.slots[self.current % self.size] = 0
+
+    def add(self, timestamp, values):
+        """Adds a (4 x items) block of sums to the bucket of `timestamp`."""
+        bucket = int(timestamp) // self.bucket_seconds
+        if self.current is not None and bucket < self.current:
+            # Older than the ring's head, only possible while warming out of order
+            if self.current - bucket >= self.size:
+                return
+        else:
+            self.advance(bucket)
+        self.slots[bucket % self.size] += values
+        for window in self.windows:
+            if self.current - bucket < window:
+                self.totals[window] += values
+
+    def mean(self, window):
+        price_sum, count = self.totals[window][0], self.totals[window][1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(count > 0, price_sum / count, np.nan)
+
+    def weighted_mean(self, window):
+        weighted_sum, volume = self.totals[window][2], self.totals[window][3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(volume > 0, weighted_sum / volume, np.nan)
+
+
+class RollingMedian:
+    """Median of the last `size` hourly means of one item, kept in a sorted window."""
+
+    __slots__ = ("size", "means", "sorted")
+
+    def __init__(self, size):
+        self.size = size
+        self.means = {}  # hour -> mean currently in the window, oldest hour first
+        self.sorted = []
+
+    def set(self, hour, mean):
+        old = self.means.pop(hour, None)
+        if old is not None:
+            del self.sorted[bisect_left(self.sorted, old)]
+        self.means[hour] = mean
+        insort(self.sorted, mean)
+        self.expire(hour)
+
+    def expire(self, hour):
+        """Drops the means that are out of the window ending at `hour`."""
+        # Hours arrive in order, so the expired ones are at the front
+        while self.means:
+            oldest = next(iter(self.means))
+            if oldest > hour - self.size:
+                break
+            del self.sorted[bisect_left(self.sorted, self.means.pop(oldest))]
+
+    def value(self, hour):
+        """Median of the window ending at `hour`, None if no mean is left in it."""
+        self.expire(hour)
+        if not self.sorted:
+            return None
+        middle = len(self.sorted) // 2
+        if len(self.sorted) % 2:
+            return self.sorted[middle]
+        return (self.sorted[middle - 1] + self.sorted[middle]) / 2
+
+
+class RollingAggregates:
+    """
+    Incrementally maintained price aggregates per item.
+
+    Every price snapshot updates hourly and daily bucket rings in O(1) per item
+    and the per-item medians in O(log n). history() then reads every strategy
+    off the running totals, so the strategy in use makes no difference to the
+    cost of a refresh.
+    """
+
+    def __init__(self):
+        self.item_index = {}
+        self.item_ids = []
+        hourly_windows = [window for ring, window in MEAN_WINDOWS.values() if ring == "hourly"]
+        daily_windows = [window for ring, window in MEAN_WINDOWS.values() if ring == "daily"]
+        self.rings = {
+            "hourly": BucketRing(HOUR, hourly_windows + [VWAP_WINDOW[1]], 0),
+            "daily": BucketRing(DAY, daily_windows, 0),
+        }
+        self.medians = []
+        # Hourly sums of the current hour, the median needs the mean of the hour so far
+        self._hour = None
+        self._hour_sums = np.zeros((2, 0))
+        self._last_sample = None
+
+    def _columns(self, item_ids):
+        new_ids = [item_id for item_id in item_ids if item_id not in self.item_index]
+        if new_ids:
+            for item_id in new_ids:
+                self.item_index[item_id] = len(self.item_ids)
+                self.item_ids.append(item_id)
+                self.medians.append(RollingMedian(MEDIAN_WINDOW))
+            for ring in self.rings.values():
+                ring.grow(len(self.item_ids))
+            self._hour_sums = np.pad(self._hour_sums, ((0, 0), (0, len(new_ids))))
+        return np.array([self.item_index[item_id] for item_id in item_ids], dtype=np.intp)
+
+    def _add(self, timestamp, columns, prices, counts, weighted, volumes):
+        block = np.zeros((4, len(self.item_ids)))
+        np.add.at(block[0], columns, prices)
+        np.add.at(block[1], columns, counts)
+        np.add.at(block[2], columns, weighted)
+        np.add.at(block[3], columns, volumes)
+        for ring in self.rings.values():
+            ring.add(timestamp, block)
+
+        hour = int(timestamp) // HOUR
+        if hour != self._hour:
+            self._hour = hour
+            self._hour_sums[:] = 0
+        self._hour_sums += block[:2]
+        for column in np.unique(columns[counts > 0]):
+            price_sum, count = self._hour_sums[:, column]
+            self.medians[column].set(hour, price_sum / count)
+
+    def update(self, latest_prices, timestamp):
+        """
+        Adds one price snapshot, once per 15 minute bucket like PriceHistoryStore.
+
+        Args:
+            latest_prices (list): Raw response of the latest prices endpoint.
+            timestamp (float): Fetch time.
+
+        Returns:
+            bool: False if the snapshot's bucket was already counted.
+        """
+        sample = int(timestamp) // SAMPLE_INTERVAL
+        if self._last_sample is not None and sample <= self._last_sample:
+            return False
+        self._last_sample = sample
+
+        entries = [(entry, sample_price(entry)) for entry in latest_prices or []]
+        entries = [(entry, price) for entry, price in entries if price is not None]
+        if not entries:
+            return True
+        columns = self._columns([entry["itemId"] for entry, _ in entries])
+        prices = np.array([price for _, price in entries], dtype=float)
+        volumes = np.array([sample_volume(entry) for entry, _ in entries], dtype=float)
+        self._add(timestamp, columns, prices, np.ones(len(entries)), prices * volumes, volumes)
+        return True
+
+    def warm(self, store, now):
+        """
+        Fills the windows from a PriceHistoryStore's rollups.
+
+        The store keeps no volumes, so warmed buckets weigh each sample as 1 in
+        the VWAP until real snapshots replace them.
+        """
+        for ring_name, table in (("hourly", "hourly"), ("daily", "daily")):
+            ring = self.rings[ring_name]
+            since = int(now) - ring.size * ring.bucket_seconds
+            for bucket, item_ids, price_sums, counts in store.rollup_buckets(table, since):
+                columns = self._columns(item_ids)
+                block = np.zeros((4, len(self.item_ids)))
+                block[0, columns] = price_sums
+                block[1, columns] = counts
+                block[2, columns] = price_sums
+                block[3, columns] = counts
+                ring.add(bucket, block)
+
+        for bucket, item_ids, price_sums, counts in store.rollup_buckets("hourly", int(now) - MEDIAN_WINDOW * HOUR):
+            hour = bucket // HOUR
+            for item_id, price_sum, count in zip(item_ids, price_sums, counts):
+                self.medians[self.item_index[item_id]].set(hour, price_sum / count)
+            if hour == int(now) // HOUR:
+                columns = self._columns(item_ids)
+                self._hour = hour
+                self._hour_sums[0, columns] = price_sums
+                self._hour_sums[1, columns] = counts
+        last = store.last_sample()
+        if last is not None:
+            self._last_sample = last // SAMPLE_INTERVAL
+
+    def history(self, now=None):
+        """
+        Every aggregate strategy of every item, the shape PriceBook takes as history.
+
+        Args:
+            now (float, optional): End of the windows, defaults to the current time.
+                Items without a sample since then drop out of their windows.
+
+        Returns:
+            dict: item_id -> {strategy: price}, strategies without data are left out.
+        """
+        now = time.time() if now is None else now
+        for ring in self.rings.values():
+            bucket = int(now) // ring.bucket_seconds
+            if ring.current is not None and bucket > ring.current:
+                ring.advance(bucket)
+        hour = int(now) // HOUR
+
+        columns = {
+            strategy: self.rings[ring].mean(window) for strategy, (ring, window) in MEAN_WINDOWS.items()
+        }
+        columns["vwap_7d"] = self.rings[VWAP_WINDOW[0]].weighted_mean(VWAP_WINDOW[1])
+
+        history = {}
+        for column, item_id in enumerate(self.item_ids):
+            prices = {
+                strategy: float(values[column])
+                for strategy, values in columns.items()
+                if not np.isnan(values[column])
+            }
+            median = self.medians[column].value(hour)
+            if median is not None:
+                prices["median_7d"] = median
+            if prices:
+                history[item_id] = prices
+        return history
@@ -0,0 +1,216 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+
+# Weighted-score objectives: gold/sec and xp/sec count up, the level requirement counts down
+OBJECTIVES = ("gold", "xp", "level")
+DEFAULT_WEIGHTS = {"gold": 1.0, "xp": 0.0, "level": 0.0}
+# Distinct (weights, max_level) rankings kept for the current snapshot
+RANKING_CACHE_SIZE = 64
+
+
+class ScoredTask(NamedTuple):
+    row: object  # TaskRow
+    level_requirement: int
+    score: float
+    on_frontier: bool
+
+    def as_dict(self):
+        return {
+            **self.row._asdict(),
+            "level_requirement": self.level_requirement,
+            "score": self.score,
+            "on_frontier": self.on_frontier,
+        }
+
+
+class Ranking(NamedTuple):
+    version: int
+    weights: dict
+    max_level: int
+    frontier: tuple  # ScoredTask on the gold/xp frontier, by descending gold efficiency
+    ranked: tuple  # Every candidate ScoredTask, by descending score
+
+
+def parse_weights(values) -> dict:
+    """
+    Reads objective weights from a mapping such as request.args.
+
+    Args:
+        values (Mapping): May hold 'gold', 'xp' and 'level', missing ones keep DEFAULT_WEIGHTS.
+
+    Returns:
+        dict: objective -> weight.
+
+    Raises:
+        ValueError: If a weight is not a finite, non-negative number or all weights are 0.
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    for objective in OBJECTIVES:
+        value = values.get(objective)
+        if value is None or value == "":
+            continue
+        try:
+            weight = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Weight '{objective}' is not a number: {value}") from None
+        if not math.isfinite(weight) or weight < 0:
+            raise ValueError(f"Weight '{objective}' must be a finite number >= 0")
+        weights[objective] = weight
+    if not any(weights.values()):
+        raise ValueError("At least one weight must be greater than 0")
+    return weights
+
+
+def pareto_frontier(gold, xp):
+    """
+    Marks the tasks no other task beats on both gold/sec and xp/sec.
+
+    One sort by descending gold (ties by descending xp) and a sweep keeping the
+    best xp seen so far: a task is on the frontier when its xp beats every task
+    with more gold. O(n log n) for n tasks; of exact duplicates only one is kept.
+
+    Args:
+        gold (np.ndarray): Gold efficiency per task.
+        xp (np.ndarray): Xp efficiency per task.
+
+    Returns:
+        np.ndarray: Positions of the frontier tasks, by descending gold efficiency.
+    """
+    if not len(gold):
+        return np.empty(0, dtype=np.intp)
+    order = np.lexsort((-xp, -gold))
+    xp_sorted = xp[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], xp_sorted[:-1])))
+    return order[xp_sorted > best_before]
+
+
+def _normalized(values, higher_is_better=True):
+    """Min-max scales to 0..1 (1 is best), so weights don't depend on the units of an objective."""
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.ones(len(values))
+    scaled = (values - low) / (high - low)
+    return scaled if higher_is_better else 1 - scaled
+
+
+class SnapshotColumns:
+    """Objective columns of one ResultSnapshot, built once per snapshot version."""
+
+    def __init__(self, snapshot):
+        self.version = snapshot.version
+        self.rows = snapshot.all_tasks
+        self.gold = np.array([row.gold_efficiency for row in self.rows], dtype=float)
+        self.xp = np.array([row.xp_efficiency for row in self.rows], dtype=float)
+        self.level = np.array(
+            [snapshot.tasks[row.id].level_requirement or 0 for row in self.rows], dtype=np.int64
+        )
+        if self.rows:
+            # Scaled over every task of the snapshot, so a level filter doesn't move the scores
+            self.scaled = {
+                "gold": _normalized(self.gold),
+                "xp": _normalized(self.xp),
+                "level": _normalized(self.level.astype(float), higher_is_better=False),
+            }
+        else:
+            self.scaled = {objective: np.empty(0) for objective in OBJECTIVES}
+
+
+class TaskRanker:
+    """
+    Multi-objective views over the published results.
+
+    The gold/xp Pareto frontier and the weighted-score ranking of a snapshot
+    are computed once per (weights, max_level) and served from a small LRU
+    cache until a new snapshot version is published, so repeated queries
+    cost a dict lookup.
+    """
+
+    def __init__(self, cache_size=RANKING_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._columns = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _snapshot_columns(self, snapshot):
+        columns = self._columns
+        if columns is None or columns.version != snapshot.version:
+            columns = SnapshotColumns(snapshot)
+            with self._lock:
+                self._columns = columns
+                # A new snapshot makes every cached ranking stale
+                self._cache.clear()
+        return columns
+
+    def rank(self, snapshot, weights=None, max_level=None) -> Ranking:
+        """
+        Ranks the tasks of a snapshot by weighted score and finds their gold/xp frontier.
+
+        Args:
+            snapshot (ResultSnapshot): The published results.
+            weights (dict, optional): objective -> weight, see parse_weights(). Defaults to gold only.
+            max_level (int, optional): Leave out tasks with a higher level requirement.
+
+        Returns:
+            Ranking: The frontier and the ranking of the candidate tasks.
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        key = (snapshot.version, tuple(weights[objective] for objective in OBJECTIVES), max_level)
+        with self._lock:
+            ranking = self._cache.get(key)
+            if ranking is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return ranking
+            self.misses += 1
+
+        columns = self._snapshot_columns(snapshot)
+        candidates = np.arange(len(columns.rows), dtype=np.intp)
+        if max_level is not None:
+            candidates = candidates[columns.level <= max_level]
+
+        score = np.zeros(len(columns.rows))
+        for objective in OBJECTIVES:
+            if weights[objective]:
+                score += weights[objective] * columns.scaled[objective]
+        on_frontier = np.zeros(len(columns.rows), dtype=bool)
+        frontier = candidates[pareto_frontier(columns.gold[candidates], columns.xp[candidates])]
+        on_frontier[frontier] = True
+        # Stable sort: equal scores keep the gold efficiency order of all_tasks
+        ranked = candidates[np.argsort(-score[candidates], kind="stable")]
+
+        def scored(position):
+            return ScoredTask(
+                row=columns.rows[position],
+                level_requirement=int(columns.level[position]),
+                score=float(score[position]),
+                on_frontier=bool(on_frontier[position]),
+            )
+
+        ranking = Ranking(
+            version=snapshot.version,
+            weights=weights,
+            max_level=max_level,
+            frontier=tuple(scored(position) for position in frontier),
+            ranked=tuple(scored(position) for position in ranked),
+        )
+        with self._lock:
+            if self._columns is columns:
+                self._cache[key] = ranking
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return ranking
+
+    def stats(self):
+        with self._lock:
+            return {
+                "cached_rankings": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
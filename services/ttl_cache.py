@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """One in-progress load that concurrent callers of the same key wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Bounded TTL + LRU cache with single-flight loading.
+
+    A fresh entry is returned as is. Within `stale_ttl` after expiring, the
+    stale value is still returned right away while one background thread
+    reloads it (stale-while-revalidate). On a miss the first caller loads the
+    value and every concurrent caller for the same key waits for that one
+    load instead of starting its own. Loads returning None (not found, API
+    error) are shared with the waiting callers but never stored.
+
+    Cached values are shared between callers and must not be modified.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, max_entries: int = 256):
+        """
+        Args:
+            ttl (float): Seconds an entry is fresh.
+            stale_ttl (float, optional): Seconds after that an entry may be served while reloading.
+            max_entries (int, optional): Least recently used entries beyond this are evicted.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, loaded at)
+        self._flights = {}  # key -> _Flight
+        self._lock = threading.Lock()
+        # Metrics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self.load_errors = 0
+
+    def get(self, key, loader):
+        """
+        Returns the cached value of `key`, loading it with `loader()` if needed.
+
+        Args:
+            key (hashable): Cache key.
+            loader (callable): Loads the value, called without arguments.
+
+        Returns:
+            The value, None if the load failed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at = entry
+                age = now - loaded_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._flights:
+                        self.refreshes += 1
+                        flight = self._flights[key] = _Flight()
+                        threading.Thread(
+                            target=self._load, args=(key, loader, flight), daemon=True
+                        ).start()
+                    return value
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if leader:
+            self._load(key, loader, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _load(self, key, loader, flight):
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+        with self._lock:
+            if flight.error is not None or flight.value is None:
+                self.load_errors += 1
+            else:
+                self._entries[key] = (flight.value, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            del self._flights[key]
+        flight.done.set()
+
+    def invalidate(self, key=None):
+        """Drops one entry, or every entry if key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "stale_ttl_s": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+                "load_errors": self.load_errors,
+                "hit_rate": round((self.hits + self.stale_hits + self.coalesced) / lookups, 3) if lookups else None,
+            }
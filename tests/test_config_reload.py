@@ -0,0 +1,87 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from services.config_loader import DEFAULT_CONFIG_PATH, load_game_config
+from services.config_reload import ConfigWatcher
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+
+
+class ConfigWatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "configData.json")
+        with open(self.path, "w") as config_file:
+            config_file.write('{"Items": {"Items": []}, "Tasks": {}}')
+        self.watcher = ConfigWatcher(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def rewrite(self, text):
+        with open(self.path, "w") as config_file:
+            config_file.write(text)
+
+    def test_change_is_reported_until_committed(self):
+        self.rewrite('{"Items": {"Items": []}, "Tasks": {"Mining": []}}')
+
+        change = self.watcher.poll()
+        self.assertIsNotNone(change)
+        self.assertEqual(self.watcher.poll(), change)
+
+        self.watcher.commit(*change)
+        self.assertIsNone(self.watcher.poll())
+
+    def test_same_content_is_no_change(self):
+        self.rewrite('{"Items": {"Items": []}, "Tasks": {}}')
+
+        self.assertIsNone(self.watcher.poll())
+
+
+class ReloadRetryTests(unittest.TestCase):
+    """A config that fails to load is loaded again on the next check."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "configData.json")
+        shutil.copy(DEFAULT_CONFIG_PATH, self.path)
+        self.previous = main.config_watcher, main.load_game_config
+        main.config_watcher = ConfigWatcher(self.path)
+        self.loads = 0
+
+    def tearDown(self):
+        main.config_watcher, main.load_game_config = self.previous
+        shutil.rmtree(self.directory)
+
+    def test_failed_load_is_retried(self):
+        def failing_load():
+            self.loads += 1
+            raise ValueError("half-written file")
+
+        def load():
+            self.loads += 1
+            return load_game_config(self.path, None)
+
+        # Same items and tasks, different bytes
+        with open(self.path, "a") as config_file:
+            config_file.write("\n")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.load_game_config = failing_load
+            main.reload_game_config()
+            main.load_game_config = load
+            main.reload_game_config()
+            main.reload_game_config()
+
+        # Loaded again after the failure, then committed
+        self.assertEqual(self.loads, 2)
+        self.assertIsNone(main.config_watcher.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
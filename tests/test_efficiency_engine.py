@@ -0,0 +1,84 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.efficiency_engine import EfficiencyEngine
+
+
+def item(item_id, base_value=0):
+    return SimpleNamespace(id=item_id, base_value=base_value)
+
+
+def task(task_id, reward, item_amount, base_time, exp_reward, costs=()):
+    return SimpleNamespace(
+        id=task_id,
+        item_reward=reward,
+        item_amount=item_amount,
+        base_time=base_time,
+        exp_reward=exp_reward,
+        costs=[SimpleNamespace(item=cost_item, amount=amount) for cost_item, amount in costs],
+    )
+
+
+ORE = item(1, base_value=2)
+COAL = item(2, base_value=1)
+BAR = item(3, base_value=10)
+RING = item(4, base_value=500)
+
+
+class EfficiencyEngineTests(unittest.TestCase):
+    def setUp(self):
+        tasks = [
+            # 2 bars from 3 ore + 1 coal + an untradeable material, 4s, 20 xp
+            task(0, BAR, 2, 4000, 20, costs=[(ORE, 3), (COAL, 1), (None, 5)]),
+            # Sold to the game shop: the base value beats the market
+            task(1, RING, 1, 10000, 50, costs=[(BAR, 1)]),
+            # No reward, nothing to sell
+            task(2, None, 0, 5000, 10),
+        ]
+        self.engine = EfficiencyEngine(SimpleNamespace(tasks=tasks, categories=[]))
+
+    def prices(self, sell, buy):
+        """Price vectors over the engine's items from item id -> price dicts."""
+        def vector(prices):
+            return np.array([prices.get(item_id, np.nan) for item_id in self.engine.item_ids], dtype=float)
+        return vector(sell), vector(buy)
+
+    def test_matches_hand_computed_task(self):
+        sell, buy = self.prices({BAR.id: 40, RING.id: 100}, {ORE.id: 12, COAL.id: 5, BAR.id: 45})
+        result = self.engine.evaluate(sell, buy)
+
+        # Revenue 2 * 40 = 80, costs 3 * 12 + 1 * 5 = 41
+        self.assertTrue(result.valid[0])
+        self.assertAlmostEqual(result.revenue[0], 80)
+        self.assertAlmostEqual(result.total_cost[0], 41)
+        self.assertAlmostEqual(result.net_profit[0], 39)
+        self.assertAlmostEqual(result.gold_efficiency[0], 39 / 4)
+        self.assertAlmostEqual(result.xp_efficiency[0], 20 / 4)
+        self.assertFalse(result.sold_as_base_price[0])
+
+        # Base value 500 beats the market price 100
+        self.assertTrue(result.sold_as_base_price[1])
+        self.assertAlmostEqual(result.revenue[1], 500)
+        self.assertAlmostEqual(result.gold_efficiency[1], (500 - 45) / 10)
+
+        self.assertFalse(result.valid[2])
+
+    def test_multipliers_scale_time_and_xp(self):
+        sell, buy = self.prices({BAR.id: 40, RING.id: 100}, {ORE.id: 12, COAL.id: 5, BAR.id: 45})
+        result = self.engine.evaluate(sell, buy, time_multiplier=0.5, xp_multiplier=2.0)
+
+        self.assertAlmostEqual(result.gold_efficiency[0], 39 / 2)
+        self.assertAlmostEqual(result.xp_efficiency[0], 2 * 20 / 2)
+
+    def test_missing_material_price_invalidates_task(self):
+        sell, buy = self.prices({BAR.id: 40, RING.id: 100}, {ORE.id: 12, BAR.id: 45})
+        result = self.engine.evaluate(sell, buy)
+
+        self.assertFalse(result.valid[0])
+        self.assertTrue(result.valid[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
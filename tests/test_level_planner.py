@@ -0,0 +1,43 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.level_planner import LevelPlanner
+
+
+def task(task_id, level_requirement, costs=()):
+    return SimpleNamespace(id=task_id, level_requirement=level_requirement, costs=list(costs))
+
+
+class LevelPlannerTests(unittest.TestCase):
+    def setUp(self):
+        tasks = [task(0, 1), task(1, 10)]
+        self.category = SimpleNamespace(name="Mining", tasks=tasks)
+        self.engine = SimpleNamespace(
+            tasks=tasks,
+            exp_reward=np.array([10.0, 40.0]),
+            base_time=np.array([5.0, 10.0]),
+            has_reward=np.array([False, False]),
+            result=None,
+        )
+        self.planner = LevelPlanner()
+
+    def test_switches_to_the_faster_task_once_unlocked(self):
+        plan = self.planner.plan(self.engine, self.category, 0, 20)
+
+        self.assertEqual([step.task_id for step in plan.steps], [0, 1])
+        self.assertEqual([(step.from_level, step.to_level) for step in plan.steps], [(1, 10), (10, 20)])
+
+    def test_numbers_are_plain_floats(self):
+        plan = self.planner.plan(self.engine, self.category, 123, 20)
+
+        for step in plan.steps:
+            for value in (step.xp, step.seconds, step.gold):
+                self.assertIs(type(value), float)
+            self.assertIs(type(step.actions), int)
+        self.assertIs(type(plan.total_seconds), float)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.api_client import APIClient
+from services.async_api_client import AsyncAPIClient
+from services.player_market_service import PlayerMarketService
+from services.rate_limiter import TokenBucket
+
+
+MAX_CONCURRENCY = 3
+FAILING_ITEM = 13
+# item id -> seconds the stub takes to answer, 0.05 for the rest
+DELAYS = {0: 0.3, 1: 0.15, 2: 0.0}
+
+
+class StubMarketHandler(BaseHTTPRequestHandler):
+    """Answers /api/PlayerMarket/items/.../<item id> with {"itemId": id}, counting requests in flight."""
+
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            item_id = int(self.path.split("?")[0].rsplit("/", 1)[1])
+            time.sleep(DELAYS.get(item_id, 0.05))
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+        status = 404 if item_id == FAILING_ITEM else 200
+        body = json.dumps({"itemId": item_id}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PlayerMarketBatchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubMarketHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubMarketHandler.max_in_flight = 0
+        api_client = APIClient(max_retries=0)
+        api_client.base_url = f"http://127.0.0.1:{self.server.server_port}/api"
+        fast = (1000, 100)
+        self.service = PlayerMarketService(
+            api_client,
+            async_client=AsyncAPIClient(
+                api_client, max_concurrency=MAX_CONCURRENCY, rate_limiter=TokenBucket(*fast)
+            ),
+            rate_limits={
+                "items/prices/latest/comprehensive/{id}": fast,
+                "items/prices/history/{id}": fast,
+            },
+        )
+        # The client logs every request
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+
+    def tearDown(self):
+        self.quiet.__exit__(None, None, None)
+
+    def test_batch_never_exceeds_max_concurrency(self):
+        item_ids = list(range(20, 35))
+        results = self.service.get_items_prices_latest_comprehensive_batch(item_ids)
+
+        self.assertEqual(results, {item_id: {"itemId": item_id} for item_id in item_ids})
+        self.assertEqual(StubMarketHandler.max_in_flight, MAX_CONCURRENCY)
+
+    def test_stream_yields_in_completion_order(self):
+        async def stream():
+            return [item_id async for item_id, _data in self.service.stream_items_prices_history([0, 1, 2])]
+
+        # Slowest first in the request, last in the stream
+        self.assertEqual(asyncio.run(stream()), [2, 1, 0])
+
+    def test_failing_item_yields_none(self):
+        results = self.service.get_items_prices_history_batch([5, FAILING_ITEM, 6])
+
+        self.assertEqual(results, {5: {"itemId": 5}, FAILING_ITEM: None, 6: {"itemId": 6}})
+
+
+if __name__ == "__main__":
+    unittest.main()
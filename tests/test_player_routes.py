@@ -0,0 +1,51 @@
+import contextlib
+import io
+import unittest
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+from services.result_snapshot import ResultSnapshot
+
+
+PROFILE = {"username": "tester", "skillExperiences": {"mining": 0}, "enchantmentBoosts": {}}
+
+
+class WarmStartPlayerTests(unittest.TestCase):
+    """A restored snapshot is served while the engine has no prices yet."""
+
+    def setUp(self):
+        self.previous = main.current_snapshot, main.player_service.get_profile
+        main.publish_snapshot(ResultSnapshot(
+            version=1, price_book=None, tasks=list(main.efficiency_engine.tasks), categories=[], all_tasks=[]
+        ))
+        main.player_service.get_profile = lambda name: PROFILE
+        self.client = main.app.test_client()
+
+    def tearDown(self):
+        snapshot, main.player_service.get_profile = self.previous
+        main.publish_snapshot(snapshot)
+
+    def test_engine_without_prices_has_no_player_results(self):
+        self.assertIsNone(main.efficiency_engine.sell)
+        self.assertIsNone(main.score_player(main.PlayerModifiers.from_profile(PROFILE)))
+
+    def test_player_api_answers_loading(self):
+        response = self.client.get("/api/player/tester")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_player_page_answers_loading(self):
+        response = self.client.get("/player/tester")
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_level_plan_answers_loading(self):
+        response = self.client.get("/api/level-plan/Mining?target=10&objective=gold")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
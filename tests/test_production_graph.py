@@ -0,0 +1,68 @@
+import unittest
+from types import SimpleNamespace
+
+from services.production_graph import ProductionGraph
+
+
+ORE = 1
+BAR = 2
+BAR_PRICE = 100
+
+
+def task(task_id, reward, base_time, costs=()):
+    return SimpleNamespace(
+        id=task_id,
+        item_reward=SimpleNamespace(id=reward, base_value=1),
+        item_amount=1,
+        base_time=base_time,
+        costs=[SimpleNamespace(item=SimpleNamespace(id=item_id), amount=amount) for item_id, amount in costs],
+    )
+
+
+class PriceBook:
+    def __init__(self, prices):
+        self.prices = prices
+
+    def buy_price(self, item_id):
+        return self.prices.get(item_id)
+
+    def sell_price(self, item_id):
+        return self.prices.get(item_id)
+
+
+class ProductionGraphTests(unittest.TestCase):
+    """Smelting a bar from 2 ore (5s), where mining one ore takes 10s."""
+
+    def setUp(self):
+        tasks = [
+            task(0, ORE, base_time=10000),
+            task(1, BAR, base_time=5000, costs=[(ORE, 2)]),
+        ]
+        self.graph = ProductionGraph(SimpleNamespace(tasks=tasks))
+
+    def test_buys_cheap_material_even_though_making_is_free(self):
+        # Buying: (100 - 2) / 5s = 19.6 gold/s, mining it: 100 / 25s = 4 gold/s
+        plan = self.graph.update(PriceBook({ORE: 1, BAR: BAR_PRICE}))[1]
+
+        self.assertEqual([material.source for material in plan.materials], ["buy"])
+        self.assertAlmostEqual(plan.labor_seconds, 5)
+        self.assertAlmostEqual(plan.gold_per_hour, 98 / 5 * 3600)
+
+    def test_makes_material_when_that_earns_more_per_hour(self):
+        # Buying: (100 - 90) / 5s = 2 gold/s, mining it: 100 / 25s = 4 gold/s
+        plan = self.graph.update(PriceBook({ORE: 45, BAR: BAR_PRICE}))[1]
+
+        self.assertEqual([material.source for material in plan.materials], ["make"])
+        self.assertEqual(plan.materials[0].producer_id, 0)
+        self.assertAlmostEqual(plan.labor_seconds, 25)
+        self.assertAlmostEqual(plan.gold_per_hour, 100 / 25 * 3600)
+
+    def test_price_update_switches_the_decision(self):
+        self.graph.update(PriceBook({ORE: 1, BAR: BAR_PRICE}))
+        plan = self.graph.update(PriceBook({ORE: 45, BAR: BAR_PRICE}))[1]
+
+        self.assertEqual(plan.materials[0].source, "make")
+
+
+if __name__ == "__main__":
+    unittest.main()
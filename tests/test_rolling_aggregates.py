@@ -0,0 +1,45 @@
+import unittest
+
+from services.price_history import DAY, HOUR
+from services.rolling_aggregates import RollingAggregates
+
+
+START = 1_700_000_000 - 1_700_000_000 % DAY
+
+
+def prices(**by_item):
+    return [{"itemId": int(item_id[1:]), "dailyAveragePrice": price} for item_id, price in by_item.items()]
+
+
+class RollingAggregatesTests(unittest.TestCase):
+    def setUp(self):
+        self.aggregates = RollingAggregates()
+        # i1 trades once, i2 keeps trading
+        self.aggregates.update(prices(i1=100, i2=50), START)
+
+    def test_fresh_sample_is_in_every_window(self):
+        history = self.aggregates.history(START + HOUR)
+
+        self.assertEqual(history[1]["average_7d"], 100)
+        self.assertEqual(history[1]["median_7d"], 100)
+        self.assertEqual(history[1]["average_30d"], 100)
+
+    def test_windows_expire_without_new_samples(self):
+        later = START + 10 * DAY
+        self.aggregates.update(prices(i2=60), later)
+        history = self.aggregates.history(later)
+
+        self.assertNotIn("average_7d", history[1])
+        self.assertNotIn("median_7d", history[1])
+        self.assertNotIn("vwap_7d", history[1])
+        self.assertEqual(history[1]["average_30d"], 100)
+        self.assertEqual(history[2]["median_7d"], 60)
+
+    def test_history_advances_time_by_itself(self):
+        history = self.aggregates.history(START + 40 * DAY)
+
+        self.assertEqual(history, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,8 @@
 import json
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
 
 
 class XP:
@@ -9,16 +13,19 @@ class XP:
             for lvl in data.values():
                 self.table.append(lvl["xp"])
 
+        self.max_level = len(self.table)
+        # table[level - 1] is the total xp level `level` starts at
+        self.xp_array = np.array(self.table, dtype=float)
+        # xp_to_next[level - 1]: xp from the start of `level` to the next one, 0 at the max level
+        self.xp_to_next = np.append(np.diff(self.xp_array), 0.0)
+
     def xp_to_level(self, xp: float) -> int:
         if xp < 0:
             # todo: Throw Error
             print("INVALID XP:", xp)
             return -1
-        num_levels = len(self.table)
-        for lvl in range(num_levels):
-            if xp < self.table[lvl]:
-                return lvl
-        return num_levels
+        # Number of levels whose start is <= xp, O(log n)
+        return bisect_right(self.table, xp)
 
     def level_to_xp(self, level: float) -> int:
         if 1 > level or level > len(self.table):
@@ -26,3 +33,99 @@ class XP:
             print("INVALID LEVEL:", level)
             return -1
         return self.table[level - 1]
+
+    def levels(self, xp_values) -> np.ndarray:
+        """
+        Vectorized xp_to_level().
+
+        Args:
+            xp_values (array_like): Total xp, any shape.
+
+        Returns:
+            np.ndarray: The levels as ints, -1 where the xp is negative.
+        """
+        xp_values = np.asarray(xp_values, dtype=float)
+        levels = np.searchsorted(self.xp_array, xp_values, side="right")
+        return np.where(xp_values < 0, -1, levels)
+
+    def fractional_levels(self, xp_values) -> np.ndarray:
+        """
+        Levels with the progress towards the next level as the fraction, e.g. 41.25.
+
+        The max level stays a whole number, negative xp gives NaN.
+        """
+        xp_values = np.asarray(xp_values, dtype=float)
+        levels = self.levels(xp_values)
+        index = np.clip(levels, 1, self.max_level) - 1
+        span = self.xp_to_next[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(span > 0, (xp_values - self.xp_array[index]) / span, 0.0)
+        return np.where(levels < 0, np.nan, levels + fraction)
+
+    def xp_remaining(self, xp_values) -> np.ndarray:
+        """Xp still needed to reach the next level, 0 at the max level, NaN for negative xp."""
+        xp_values = np.asarray(xp_values, dtype=float)
+        levels = self.levels(xp_values)
+        next_start = np.append(self.xp_array[1:], np.nan)[np.clip(levels, 1, self.max_level) - 1]
+        remaining = np.where(levels >= self.max_level, 0.0, next_start - xp_values)
+        return np.where(levels < 0, np.nan, remaining)
+
+    def progress(self, xp: float) -> dict:
+        """
+        Level progress of one xp value.
+
+        Returns:
+            dict: level, fractional_level, xp_into_level, xp_for_level (xp from this level
+                to the next, 0 at the max level) and xp_to_next_level.
+        """
+        level = self.xp_to_level(xp)
+        if level < 0:
+            return None
+        return {
+            "level": level,
+            "fractional_level": float(self.fractional_levels(xp)),
+            "xp_into_level": xp - self.table[level - 1],
+            "xp_for_level": float(self.xp_to_next[level - 1]),
+            "xp_to_next_level": float(self.xp_remaining(xp)),
+        }
+
+    def skill_levels(self, skill_experiences: dict, fractional=False) -> dict:
+        """
+        Converts a profile's skillExperiences (skill -> xp) in one vectorized call.
+
+        Returns:
+            dict: skill -> level (int), or fractional level (float) if `fractional`.
+        """
+        skills = list(skill_experiences)
+        xp_values = [max(float(skill_experiences[skill] or 0), 0.0) for skill in skills]
+        if fractional:
+            return dict(zip(skills, self.fractional_levels(xp_values).tolist()))
+        return dict(zip(skills, self.levels(xp_values).tolist()))
+
+    def clan_levels(self, member_experiences: dict, fractional=False) -> dict:
+        """
+        skill_levels() for many players at once, e.g. every member of a clan.
+
+        Args:
+            member_experiences (dict): name -> skillExperiences.
+
+        Returns:
+            dict: name -> {skill: level}
+        """
+        keys = [
+            (name, skill)
+            for name, experiences in member_experiences.items()
+            for skill in (experiences or {})
+        ]
+        xp_values = [max(float(member_experiences[name][skill] or 0), 0.0) for name, skill in keys]
+        converted = (self.fractional_levels if fractional else self.levels)(xp_values).tolist()
+        levels = {name: {} for name in member_experiences}
+        for (name, skill), level in zip(keys, converted):
+            levels[name][skill] = level
+        return levels
+
+
+@lru_cache(maxsize=None)
+def default_xp_table(file_path="data/xp_table.json") -> XP:
+    """The XP table loaded once per process."""
+    return XP(file_path)